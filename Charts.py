@@ -0,0 +1,114 @@
+import numpy as np
+import plotly.graph_objs as go
+
+# Above this many processes, bars show the mean of consecutive groups of processes
+MAX_CHART_BARS = 5000
+
+# Above this many processes, the pie shows the largest ones and an "Other" slice
+MAX_PIE_SLICES = 1000
+
+# Color of bars and slices that stand for several processes
+AGGREGATE_COLOR = '#7f7f7f'
+
+
+def build_bar_chart(metrics, values, colors, title, yaxis_title):
+    """Build a bar chart of one metric with a single vectorized trace.
+
+    Each process gets its own bar up to MAX_CHART_BARS processes. Beyond
+    that, consecutive processes (in order of first dispatch) are grouped into
+    MAX_CHART_BARS bars showing their mean, so the chart costs the same for
+    millions of processes as for a few thousand.
+
+    Args:
+        metrics (ScheduleMetrics): Metrics of the schedule.
+        values (numpy.ndarray): Metric value of each process, aligned with ``metrics``.
+        colors (callable): Returns the color of a process ID.
+        title (str): Chart title.
+        yaxis_title (str): Title of the value axis.
+
+    Returns:
+        go.Figure: The bar chart.
+    """
+    values = np.asarray(values)
+    if len(values) <= MAX_CHART_BARS:
+        pids = metrics.pids
+        bar = go.Bar(x=np.asarray(pids, dtype=object), y=values,
+                     marker_color=np.asarray([colors(pid) for pid in pids], dtype=object))
+    else:
+        starts = np.arange(MAX_CHART_BARS) * len(values) // MAX_CHART_BARS
+        counts = np.diff(np.append(starts, len(values)))
+        means = np.add.reduceat(values.astype(np.float64), starts) / counts
+        labels = np.empty(MAX_CHART_BARS, dtype=object)
+        labels[:] = [f"{metrics.pid_at(start)}\u2013{metrics.pid_at(start + count - 1)}"
+                     for start, count in zip(starts.tolist(), counts.tolist())]
+        bar = go.Bar(x=labels, y=means, customdata=counts, marker_color=AGGREGATE_COLOR,
+                     hovertemplate="%{x}<br>mean of %{customdata} processes: %{y}<extra></extra>")
+        title = f"{title} (mean per group of {len(values) // MAX_CHART_BARS}+ processes)"
+    fig = go.Figure(data=[bar])
+    fig.update_layout(
+        title=title,
+        xaxis=dict(title='Process', type='category'),
+        yaxis=dict(title=yaxis_title),
+        showlegend=False,
+    )
+    return fig
+
+
+def build_utilization_chart(metrics, colors):
+    """Build a pie chart of each process's share of the CPU time.
+
+    Beyond MAX_PIE_SLICES processes only the ones with the most CPU time get a
+    slice; the rest are summed into an "Other" slice.
+
+    Args:
+        metrics (ScheduleMetrics): Metrics of the schedule.
+        colors (callable): Returns the color of a process ID.
+
+    Returns:
+        go.Figure: The pie chart.
+    """
+    burst = np.asarray(metrics.burst, dtype=np.float64)
+    share = burst / burst.sum() * 100
+    if len(share) <= MAX_PIE_SLICES:
+        labels = metrics.pids
+        slice_colors = [colors(pid) for pid in labels]
+    else:
+        top = np.argpartition(share, -(MAX_PIE_SLICES - 1))[-(MAX_PIE_SLICES - 1):]
+        top = top[np.argsort(share[top])[::-1]]
+        labels = [metrics.pid_at(i) for i in top.tolist()]
+        slice_colors = [colors(pid) for pid in labels] + [AGGREGATE_COLOR]
+        labels.append(f"Other ({len(share) - len(top)} processes)")
+        share = np.append(share[top], share.sum() - share[top].sum())
+    fig = go.Figure(data=[go.Pie(labels=labels, values=share, hole=0.3,
+                                 marker=dict(colors=np.asarray(slice_colors, dtype=object)))])
+    fig.update_layout(title='CPU Utilization Per Process')
+    return fig
+
+
+def build_sweep_figure(results, attributes, title, yaxis_title):
+    """Build a line chart of sweep results against the time quantum.
+
+    Args:
+        results (dict): Mapping of algorithm name to its ComparisonResults, one per quantum.
+        attributes (dict): Mapping of ComparisonResult attribute to its label, one line each per algorithm.
+        title (str): Chart title.
+        yaxis_title (str): Title of the value axis.
+
+    Returns:
+        go.Figure: The line chart.
+    """
+    data = []
+    for algorithm, points in results.items():
+        points = [point for point in points if point.error is None]
+        quanta = [point.quantum for point in points]
+        for attribute, label in attributes.items():
+            name = f"{algorithm} {label}" if len(attributes) > 1 else algorithm
+            data.append(go.Scatter(x=quanta, y=[getattr(point, attribute) for point in points],
+                                   mode='lines+markers', name=name))
+    fig = go.Figure(data=data)
+    fig.update_layout(
+        title=title,
+        xaxis=dict(title='Time Quantum'),
+        yaxis=dict(title=yaxis_title),
+    )
+    return fig
@@ -0,0 +1,255 @@
+from concurrent.futures import ProcessPoolExecutor, wait
+import multiprocessing
+import os
+import time
+
+import numpy as np
+
+from Metrics import context_switches, schedule_metrics
+from ProcessTable import ProcessTable
+from SchedulingAlgorithm import make_algorithm
+
+COMPARED_ALGORITHMS = ("FCFS", "SJF", "SRTF", "Priority", "RR", "PriorityRR", "MLFQ")
+
+# Algorithms whose time quantum can be swept
+SWEPT_ALGORITHMS = ("RR", "PriorityRR")
+
+# Largest number of quanta evaluated in one sweep
+MAX_SWEEP_QUANTA = 256
+
+# Below this many processes a process pool costs more than it saves
+PARALLEL_THRESHOLD = 10000
+
+# Workload of the pool a worker belongs to, installed by _init_worker()
+_workload = None
+
+
+class ComparisonResult:
+    """Summary of one algorithm's run in a comparison."""
+
+    def __init__(self, algorithm, average_waiting_time=None, average_turnaround_time=None,
+                 average_response_time=None, elapsed=None, error=None, quantum=None, context_switches=None,
+                 phase_times=None):
+        """Initialize the ComparisonResult.
+
+        Args:
+            algorithm (str): Short name of the algorithm.
+            average_waiting_time (float, optional): Mean waiting time.
+            average_turnaround_time (float, optional): Mean turnaround time.
+            average_response_time (float, optional): Mean response time.
+            elapsed (float, optional): Seconds spent scheduling and computing metrics.
+            error (str, optional): Why the algorithm produced no result.
+            quantum (int, optional): Time quantum the algorithm ran with.
+            context_switches (int, optional): Number of times the CPU switched to another process.
+            phase_times (dict, optional): Seconds spent in the schedule and metrics phases.
+        """
+        self.algorithm = algorithm
+        self.average_waiting_time = average_waiting_time
+        self.average_turnaround_time = average_turnaround_time
+        self.average_response_time = average_response_time
+        self.elapsed = elapsed
+        self.error = error
+        self.quantum = quantum
+        self.context_switches = context_switches
+        self.phase_times = phase_times
+
+
+def _init_worker(workload):
+    """Install the shared workload in a pool worker."""
+    global _workload
+    _workload = workload
+
+
+def _run_algorithm(algorithm, quantum, processes=None):
+    """Schedule a workload with one algorithm and summarize the result.
+
+    Pool workers leave ``processes`` unset and use the workload installed by
+    _init_worker(); in-process runs pass their own workload.
+    """
+    if processes is None:
+        processes = _workload
+    started = time.perf_counter()
+    try:
+        schedule = make_algorithm(algorithm, quantum).schedule(processes)
+        scheduled = time.perf_counter()
+        metrics = schedule_metrics(schedule, processes)
+    except ValueError as e:
+        return ComparisonResult(algorithm, error=str(e), quantum=quantum)
+    finished = time.perf_counter()
+    return ComparisonResult(
+        algorithm,
+        metrics.average_waiting_time,
+        metrics.average_turnaround_time,
+        metrics.average_response_time,
+        finished - started,
+        quantum=quantum,
+        context_switches=context_switches(schedule),
+        phase_times={"schedule": scheduled - started, "metrics": finished - scheduled},
+    )
+
+
+def _pool_context():
+    """Prefer fork so workers share the parsed workload copy-on-write."""
+    if "fork" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("fork")
+    return multiprocessing.get_context()
+
+
+def run_comparison(processes, quantum, algorithms=COMPARED_ALGORITHMS, max_workers=None, timeout=None):
+    """Run several scheduling algorithms on one parsed workload.
+
+    The workload is parsed and validated once by the caller. Large workloads are
+    scheduled concurrently on a process pool whose workers inherit it through
+    fork, and each worker sends back only a ComparisonResult. Without a
+    timeout, small workloads, or machines with a single CPU, run the
+    algorithms in-process one after another.
+
+    Args:
+        processes (ProcessTable): The workload to schedule.
+        quantum (int): Time quantum for the round robin algorithms.
+        algorithms (tuple, optional): Short names of the algorithms to run.
+        max_workers (int, optional): Size of the process pool. Defaults to one
+            worker per algorithm, capped at the number of CPUs.
+        timeout (float, optional): Seconds to wait for all algorithms. Those still
+            running afterwards are reported as timed out and their workers are
+            killed. With a timeout the algorithms always run in a pool.
+
+    Returns:
+        dict: Mapping of algorithm name to ComparisonResult, in the order of ``algorithms``.
+    """
+    jobs = [(algorithm, quantum) for algorithm in algorithms]
+    results = _run_jobs(processes, jobs, max_workers, timeout)
+    return dict(zip(algorithms, results))
+
+
+def parse_quanta(spec):
+    """Parse the quanta of a sweep.
+
+    Args:
+        spec (str): Either a comma separated list such as "1,2,4,8", or a range
+            "start-stop" or "start-stop:step" with both ends included.
+
+    Returns:
+        list: The distinct quanta in increasing order.
+    """
+    spec = spec.strip()
+    try:
+        if "-" in spec:
+            bounds, _, step = spec.partition(":")
+            start, _, stop = bounds.partition("-")
+            quanta = range(int(start), int(stop) + 1, int(step) if step else 1)
+        else:
+            quanta = [int(value) for value in spec.split(",") if value.strip()]
+    except ValueError:
+        raise ValueError(f"Invalid quanta: {spec!r}. Use a list such as 1,2,4 or a range such as 1-20:2")
+    quanta = sorted(set(quanta))
+    if not quanta:
+        raise ValueError("No quanta to sweep")
+    if quanta[0] < 1:
+        raise ValueError("Time quantum must be a positive integer")
+    if len(quanta) > MAX_SWEEP_QUANTA:
+        raise ValueError(f"A sweep can evaluate at most {MAX_SWEEP_QUANTA} quanta")
+    return quanta
+
+
+def run_sweep(processes, quanta, algorithms=SWEPT_ALGORITHMS, max_workers=None, timeout=None):
+    """Evaluate round robin algorithms over a range of time quanta.
+
+    The workload is sorted by arrival once for the whole sweep, so every run
+    only scans already ordered rows, and the runs are spread over a process
+    pool like run_comparison(). Only aggregate metrics are kept per quantum.
+
+    Args:
+        processes (ProcessTable): The workload to schedule.
+        quanta (list): Time quanta to evaluate.
+        algorithms (tuple, optional): Short names of the algorithms to sweep.
+        max_workers (int, optional): Size of the process pool. Defaults to the number of CPUs.
+        timeout (float, optional): Seconds to wait for the whole sweep.
+
+    Returns:
+        dict: Mapping of algorithm name to its ComparisonResults, one per quantum in order.
+    """
+    jobs = [(algorithm, quantum) for algorithm in algorithms for quantum in quanta]
+    results = iter(run_sweep_jobs(processes, jobs, max_workers, timeout))
+    return {algorithm: [next(results) for _ in quanta] for algorithm in algorithms}
+
+
+def run_sweep_jobs(processes, jobs, max_workers=None, timeout=None):
+    """Evaluate arbitrary (algorithm, quantum) pairs of a sweep in one process pool.
+
+    Like run_sweep(), but each algorithm can be evaluated at different quanta,
+    e.g. only those missing from a cache, while every run still shares one pool.
+
+    Args:
+        processes (ProcessTable): The workload to schedule.
+        jobs (list): (algorithm, quantum) pairs to evaluate.
+        max_workers (int, optional): Size of the process pool. Defaults to the number of CPUs.
+        timeout (float, optional): Seconds to wait for all the jobs.
+
+    Returns:
+        list: One ComparisonResult per job, in the order of ``jobs``.
+    """
+    if not jobs:
+        return []
+    return _run_jobs(_sorted_by_arrival(processes), jobs, max_workers, timeout)
+
+
+def _sorted_by_arrival(processes):
+    """Return the workload with its rows stably sorted by arrival time."""
+    arrival_times = processes.arrival_times
+    if np.all(arrival_times[1:] >= arrival_times[:-1]):
+        return processes
+    order = np.argsort(arrival_times, kind="stable")
+    return ProcessTable.from_columns(
+        processes.names,
+        processes.pid_index[order],
+        arrival_times[order],
+        processes.burst_times[order],
+        None if processes.priorities is None else processes.priorities[order],
+    )
+
+
+def _run_jobs(processes, jobs, max_workers=None, timeout=None):
+    """Run (algorithm, quantum) jobs on one workload, in a process pool if worthwhile.
+
+    Returns:
+        list: One ComparisonResult per job, in the order of ``jobs``.
+    """
+    # A timeout can only be enforced on pool workers, which can be killed
+    if timeout is None and (len(processes) < PARALLEL_THRESHOLD or (os.cpu_count() or 1) < 2):
+        return [_run_algorithm(algorithm, quantum, processes) for algorithm, quantum in jobs]
+
+    executor = ProcessPoolExecutor(
+        max_workers=max_workers or min(len(jobs), os.cpu_count() or 1),
+        mp_context=_pool_context(),
+        initializer=_init_worker,
+        initargs=(processes,),
+    )
+    pending = ()
+    try:
+        futures = [executor.submit(_run_algorithm, algorithm, quantum) for algorithm, quantum in jobs]
+        done, pending = wait(futures, timeout=timeout)
+        return [
+            future.result() if future in done else ComparisonResult(algorithm, error="Timed out", quantum=quantum)
+            for future, (algorithm, quantum) in zip(futures, jobs)
+        ]
+    finally:
+        if pending:
+            _terminate_workers(executor)
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _terminate_workers(executor):
+    """Kill the worker processes of a pool whose remaining jobs timed out.
+
+    Shutting the pool down only cancels jobs that have not started, and the
+    running ones would otherwise keep their CPU until they finish.
+    """
+    terminate = getattr(executor, "terminate_workers", None)
+    if terminate is not None:
+        terminate()
+        return
+    for process in list((executor._processes or {}).values()):
+        process.terminate()
+    for process in list((executor._processes or {}).values()):
+        process.join()
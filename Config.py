@@ -0,0 +1,60 @@
+import os
+
+# Settings file shipped next to the application
+APP_CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "APP_CONFIG.txt")
+
+# Ranges the workload generators need
+RANGE_KEYS = ("process_id_range", "arrival_time_range", "burst_time_range", "priority_range")
+
+
+def parse_range(value):
+    """Parse an inclusive integer range written as "low-high".
+
+    Args:
+        value (str): The range, e.g. "1-20".
+
+    Returns:
+        tuple: (low, high) as integers.
+    """
+    low, separator, high = value.strip().partition("-")
+    try:
+        if not separator:
+            raise ValueError
+        low, high = int(low), int(high)
+    except ValueError:
+        raise ValueError(f"Invalid range {value!r}, expected low-high")
+    if low > high:
+        raise ValueError(f"Invalid range {value!r}, low is greater than high")
+    return low, high
+
+
+def read_app_config(path=APP_CONFIG_PATH, overrides=None):
+    """Read the generation ranges from APP_CONFIG.txt.
+
+    Each line of the file is ``key=low-high``; blank lines and lines starting
+    with ``#`` are ignored.
+
+    Args:
+        path (str, optional): Location of the settings file.
+        overrides (dict, optional): Ranges that replace the ones in the file,
+            either as (low, high) tuples or "low-high" strings.
+
+    Returns:
+        dict: Mapping of each key in RANGE_KEYS to its (low, high) range.
+    """
+    config = {}
+    with open(path) as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            key, separator, value = line.partition("=")
+            if not separator:
+                raise ValueError(f"{path}, line {line_number}: expected key=low-high")
+            config[key.strip()] = parse_range(value)
+    for key, value in (overrides or {}).items():
+        config[key] = parse_range(value) if isinstance(value, str) else tuple(value)
+    missing = [key for key in RANGE_KEYS if key not in config]
+    if missing:
+        raise ValueError(f"{path} is missing {', '.join(missing)}")
+    return config
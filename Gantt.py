@@ -0,0 +1,158 @@
+import numpy as np
+import plotly.graph_objs as go
+
+# Above this many visible segments, segments are merged down to pixel resolution
+MAX_DETAILED_SEGMENTS = 20000
+
+# Resolution assumed when aggregating segments
+PIXEL_WIDTH = 1500
+PIXEL_HEIGHT = 600
+
+# Lanes beyond this many share traces, so the figure never holds more traces
+MAX_LANE_TRACES = 64
+
+
+def _lanes(schedule):
+    """Map each segment to the lane of its process, in order of first dispatch.
+
+    Returns:
+        tuple: (name table slot of each lane, lane of each segment).
+    """
+    pid_index = schedule.pid_index
+    first_index = np.full(len(schedule.names), len(pid_index), dtype=np.int64)
+    np.minimum.at(first_index, pid_index, np.arange(len(pid_index)))
+    dispatched = np.flatnonzero(first_index < len(pid_index))
+    slots = dispatched[np.argsort(first_index[dispatched], kind="stable")]
+    lane_of = np.zeros(len(schedule.names), dtype=np.int64)
+    lane_of[slots] = np.arange(len(slots))
+    return slots, lane_of[pid_index]
+
+
+def _lane_labels(names, slots, lanes):
+    """Return the process name of each lane in ``lanes``, looking up each distinct lane once."""
+    used, inverse = np.unique(lanes, return_inverse=True)
+    labels = np.empty(len(used), dtype=object)
+    labels[:] = [str(names[slot]) for slot in slots[used].tolist()]
+    return labels[inverse]
+
+
+def _row_labels(names, slots):
+    """Label each of the PIXEL_HEIGHT rows with the range of processes whose lanes it holds."""
+    count = len(slots)
+    labels = np.empty(PIXEL_HEIGHT, dtype=object)
+    for row in range(PIXEL_HEIGHT):
+        # Lanes l with l * PIXEL_HEIGHT // count == row
+        first = -(-row * count // PIXEL_HEIGHT)
+        last = -(-(row + 1) * count // PIXEL_HEIGHT) - 1
+        first_name, last_name = names[int(slots[first])], names[int(slots[last])]
+        labels[row] = str(first_name) if first == last else f"{first_name} to {last_name}"
+    return labels
+
+
+def aggregate_segments(lanes, starts, ends, resolution):
+    """Merge segments of the same lane that overlap or are closer than ``resolution``.
+
+    Args:
+        lanes (numpy.ndarray): Lane of each segment.
+        starts (numpy.ndarray): Start time of each segment.
+        ends (numpy.ndarray): End time of each segment.
+        resolution (float): Gaps up to this width are closed.
+
+    Returns:
+        tuple: (lanes, starts, ends) of the merged segments.
+    """
+    if len(lanes) == 0:
+        return lanes, starts, ends
+    order = np.lexsort((starts, lanes))
+    lanes, starts, ends = lanes[order], starts[order], ends[order]
+    # Offsetting every lane past the previous one lets a single cumulative
+    # maximum give the furthest end reached so far within each lane
+    offset = lanes * (float(ends.max() - starts.min()) + 1.0)
+    reach = np.maximum.accumulate(ends + offset) - offset
+    new_group = np.empty(len(lanes), dtype=bool)
+    new_group[0] = True
+    new_group[1:] = (lanes[1:] != lanes[:-1]) | (starts[1:] - reach[:-1] > resolution)
+    first = np.flatnonzero(new_group)
+    return lanes[first], starts[first], np.maximum.reduceat(ends, first)
+
+
+def build_gantt_figure(schedule, x_range=None, colors=None):
+    """Build a WebGL Gantt chart with level-of-detail aggregation.
+
+    Segments are packed into array-backed Scattergl traces, one per process
+    lane (lanes share traces beyond MAX_LANE_TRACES). When more than
+    MAX_DETAILED_SEGMENTS segments are visible, segments closer together than
+    one pixel are merged (and lanes share rows if there are more lanes than
+    pixel rows); zooming in with ``x_range`` shows full detail again.
+
+    Args:
+        schedule (Schedule): The schedule to draw.
+        x_range (tuple, optional): Visible (start, end) time range. Defaults to the whole schedule.
+        colors (callable, optional): Returns the color of a process name.
+
+    Returns:
+        go.Figure: The Gantt chart.
+    """
+    slots, lanes = _lanes(schedule)
+    # Only the names of lanes that are drawn individually are looked up
+    pids = [schedule.names[slot] for slot in slots[:MAX_LANE_TRACES].tolist()]
+    lane_count = len(slots)
+    starts = schedule.start_times.astype(np.float64)
+    ends = starts + schedule.durations
+    if x_range is None:
+        x_range = (float(starts.min()), float(ends.max())) if len(starts) else (0.0, 1.0)
+    else:
+        visible = (ends >= x_range[0]) & (starts <= x_range[1])
+        lanes, starts, ends = lanes[visible], starts[visible], ends[visible]
+    labels = None
+    if len(starts) > MAX_DETAILED_SEGMENTS:
+        resolution = (x_range[1] - x_range[0]) / PIXEL_WIDTH
+        if lane_count > PIXEL_HEIGHT:
+            # More lanes than pixel rows: neighbouring lanes share a row
+            rows = lanes * PIXEL_HEIGHT // lane_count
+            rows, starts, ends = aggregate_segments(rows, starts, ends, resolution)
+            lanes = rows * lane_count // PIXEL_HEIGHT
+            labels = _row_labels(schedule.names, slots)[rows]
+        else:
+            lanes, starts, ends = aggregate_segments(lanes, starts, ends, resolution)
+    per_lane = lane_count <= MAX_LANE_TRACES
+    if labels is None and not per_lane:
+        labels = _lane_labels(schedule.names, slots, lanes)
+
+    traces = min(lane_count, MAX_LANE_TRACES)
+    trace_of = lanes % traces if traces else lanes
+    order = np.argsort(trace_of, kind="stable")
+    bounds = np.searchsorted(trace_of[order], np.arange(traces + 1))
+    line_width = max(1, min(20, 400 // max(1, lane_count)))
+    data = []
+    for trace in range(traces):
+        members = order[bounds[trace]:bounds[trace + 1]]
+        # Each segment is a line from start to end followed by a NaN break
+        x = np.column_stack([starts[members], ends[members], np.full(len(members), np.nan)]).ravel()
+        y = np.column_stack([lanes[members], lanes[members], np.full(len(members), np.nan)]).ravel()
+        if per_lane:
+            hover = dict(hovertemplate=f"{pids[trace]}<br>%{{x}}<extra></extra>")
+        else:
+            # Lanes share this trace, so every point carries its own process
+            customdata = np.empty(3 * len(members), dtype=object)
+            customdata[0::3] = customdata[1::3] = labels[members]
+            hover = dict(customdata=customdata, hovertemplate="%{customdata}<br>%{x}<extra></extra>")
+        data.append(go.Scattergl(
+            x=x, y=y, mode='lines', name=pids[trace] if per_lane else None, connectgaps=False,
+            line=dict(width=line_width, color=colors(pids[trace]) if colors else None),
+            **hover,
+        ))
+
+    fig = go.Figure(data=data)
+    fig.update_layout(
+        title='Job Scheduling Gantt Chart',
+        xaxis=dict(type='linear', range=list(x_range), title='Time'),
+        yaxis=dict(
+            tickmode='array' if lane_count <= 100 else 'auto',
+            tickvals=list(range(lane_count)) if lane_count <= 100 else None,
+            ticktext=[schedule.names[slot] for slot in slots.tolist()] if lane_count <= 100 else None,
+            autorange='reversed',
+        ),
+        showlegend=per_lane,
+    )
+    return fig
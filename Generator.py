@@ -0,0 +1,106 @@
+import numpy as np
+
+from Config import read_app_config
+from ProcessTable import ProcessTable
+
+ARRIVAL_PATTERNS = ("uniform", "bursty", "heavy_tailed")
+
+# Mean number of processes per burst in the bursty pattern
+BURST_SIZE = 1000
+
+# Shape of the Pareto distributed gaps of the heavy-tailed pattern
+PARETO_SHAPE = 1.5
+
+
+class SequentialNames:
+    """Name table of consecutive numeric process IDs, built on demand.
+
+    Generated workloads number their processes, so storing millions of ID
+    strings would only cost memory; names are formatted when looked up.
+    """
+
+    def __init__(self, start, count):
+        """Initialize the SequentialNames.
+
+        Args:
+            start (int): ID of the first process.
+            count (int): Number of processes.
+        """
+        self.start = start
+        self.count = count
+
+    def __len__(self):
+        """Return the number of names."""
+        return self.count
+
+    def __getitem__(self, i):
+        """Return the ID of process ``i``."""
+        if i < 0:
+            i += self.count
+        if not 0 <= i < self.count:
+            raise IndexError("process index out of range")
+        return str(self.start + i)
+
+    def __iter__(self):
+        """Iterate over the IDs."""
+        return (str(pid) for pid in range(self.start, self.start + self.count))
+
+
+def generate_arrivals(rng, count, low, high, pattern="uniform"):
+    """Draw arrival times within [low, high].
+
+    Args:
+        rng (numpy.random.Generator): Source of randomness.
+        count (int): Number of arrival times.
+        low (int): Earliest arrival time.
+        high (int): Latest arrival time.
+        pattern (str, optional): "uniform" spreads arrivals evenly, "bursty"
+            groups them around random instants, and "heavy_tailed" separates
+            them with Pareto distributed gaps.
+
+    Returns:
+        numpy.ndarray: int64 arrival times.
+    """
+    if pattern == "uniform":
+        return rng.integers(low, high, count, endpoint=True)
+    if pattern == "bursty":
+        bursts = max(1, count // BURST_SIZE)
+        centers = rng.integers(low, high, bursts, endpoint=True)
+        spread = max(1.0, (high - low) / (bursts * 10))
+        arrivals = centers[rng.integers(0, bursts, count)] + rng.exponential(spread, count).astype(np.int64)
+        return np.minimum(arrivals, high)
+    if pattern == "heavy_tailed":
+        gaps = rng.pareto(PARETO_SHAPE, count)
+        elapsed = np.cumsum(gaps)
+        # Scale the gaps so the arrivals span the configured range
+        return low + (elapsed / elapsed[-1] * (high - low)).astype(np.int64) if count else np.zeros(0, dtype=np.int64)
+    raise ValueError(f"Unknown arrival pattern: {pattern}. Choose one of {', '.join(ARRIVAL_PATTERNS)}")
+
+
+def generate_workload(count, config=None, pattern="uniform", seed=None, priorities=True):
+    """Generate a random workload with a vectorized, seeded RNG.
+
+    Arrival, burst and priority columns are drawn straight into NumPy arrays
+    within the ranges of APP_CONFIG.txt; process IDs are numbered from the
+    low end of ``process_id_range``.
+
+    Args:
+        count (int): Number of processes.
+        config (dict, optional): Ranges from read_app_config(). Read from APP_CONFIG.txt if None.
+        pattern (str, optional): Arrival pattern, one of ARRIVAL_PATTERNS.
+        seed (int, optional): Seed for reproducible workloads.
+        priorities (bool, optional): Whether to draw a priority for every process.
+
+    Returns:
+        ProcessTable: The generated workload.
+    """
+    if count < 1:
+        raise ValueError("Number of processes must be a positive integer")
+    if config is None:
+        config = read_app_config()
+    rng = np.random.default_rng(seed)
+    arrival_times = generate_arrivals(rng, count, *config["arrival_time_range"], pattern=pattern)
+    burst_times = rng.integers(*config["burst_time_range"], count, endpoint=True)
+    priority = rng.integers(*config["priority_range"], count, endpoint=True) if priorities else None
+    names = SequentialNames(config["process_id_range"][0], count)
+    return ProcessTable.from_columns(names, np.arange(count, dtype=np.int32), arrival_times, burst_times, priority)
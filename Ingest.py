@@ -0,0 +1,214 @@
+from array import array
+import mmap
+import os
+import sys
+
+from ProcessTable import MISSING_PRIORITY, ProcessTable
+from WorkloadFile import is_workload_file, load_workload
+
+# Size of each read from the uploaded file
+CHUNK_SIZE = 1 << 20
+
+# Stop collecting bad rows after this many and report them
+MAX_REPORTED_ERRORS = 20
+
+
+class IngestError(ValueError):
+    """Raised when an uploaded workload cannot be parsed."""
+
+    def __init__(self, message, line_errors=()):
+        """Initialize the IngestError.
+
+        Args:
+            message (str): Summary of the problem.
+            line_errors (list, optional): (line number, reason) pairs for the bad rows.
+        """
+        self.line_errors = list(line_errors)
+        details = "; ".join(f"line {line}: {reason}" for line, reason in self.line_errors)
+        super().__init__(f"{message} ({details})" if details else message)
+
+
+class _ColumnBuilder:
+    """Typed column buffers filled one CSV row at a time.
+
+    The priority column is only allocated once a row has a priority; rows
+    without one hold MISSING_PRIORITY.
+    """
+
+    def __init__(self):
+        self.index = {}
+        self.pid_index = array("i")
+        self.arrival_times = array("q")
+        self.burst_times = array("q")
+        self.priorities = array("q")
+
+    def add_row(self, line):
+        """Parse one CSV line and append it to the columns."""
+        fields = line.split(b",")
+        if len(fields) not in (3, 4):
+            raise ValueError(f"expected 3 or 4 columns, got {len(fields)}")
+        pid = sys.intern(fields[0].strip().strip(b'"').decode("utf-8"))
+        arrival_time = int(fields[1])
+        burst_time = int(fields[2])
+        priority = fields[3].strip() if len(fields) == 4 else b"None"
+        if priority not in (b"None", b""):
+            priority = int(priority)
+            if len(self.priorities) < len(self.pid_index):
+                # The rows read before the first priority have none
+                self.priorities.extend(array("q", [MISSING_PRIORITY]) * (len(self.pid_index) - len(self.priorities)))
+            self.priorities.append(priority)
+        elif self.priorities:
+            self.priorities.append(MISSING_PRIORITY)
+        self.pid_index.append(self.index.setdefault(pid, len(self.index)))
+        self.arrival_times.append(arrival_time)
+        self.burst_times.append(burst_time)
+
+    def build(self):
+        """Wrap the buffers in a ProcessTable without copying them."""
+        return ProcessTable.from_columns(
+            list(self.index),
+            self.pid_index,
+            self.arrival_times,
+            self.burst_times,
+            self.priorities if self.priorities else None,
+        )
+
+
+def read_workload(stream, chunk_size=CHUNK_SIZE, max_rows=None, max_bytes=None):
+    """Parse a CSV or binary workload from a binary stream into a ProcessTable.
+
+    The stream is read in fixed-size byte chunks and every row is appended
+    straight into typed column buffers, so no per-row Python objects are kept.
+    Each line is either ``process_id,arrival_time,burst_time`` or
+    ``process_id,arrival_time,burst_time,priority``; blank lines are skipped.
+    Streams that start with the binary workload magic (see WorkloadFile) are
+    mapped instead of parsed.
+
+    Args:
+        stream: Binary file-like object with a ``read(size)`` method.
+        chunk_size (int, optional): Bytes to read at a time.
+        max_rows (int, optional): Reject workloads with more rows than this.
+        max_bytes (int, optional): Reject files larger than this.
+
+    Returns:
+        ProcessTable: The parsed workload.
+
+    Raises:
+        IngestError: If rows are malformed, there are none, or a limit is exceeded.
+    """
+    return next(iter_workload(stream, None, chunk_size, max_rows, max_bytes))
+
+
+def iter_workload(stream, rows_per_table, chunk_size=CHUNK_SIZE, max_rows=None, max_bytes=None):
+    """Read a CSV or binary workload as a sequence of ProcessTables.
+
+    Each table holds the next ``rows_per_table`` rows of the file, with its own
+    name table, so a trace larger than memory can be processed a window at a
+    time. The format is the same as for read_workload().
+
+    Args:
+        stream: Binary file-like object with a ``read(size)`` method.
+        rows_per_table (int): Rows per table, or None for a single table.
+        chunk_size (int, optional): Bytes to read at a time.
+        max_rows (int, optional): Reject workloads with more rows than this.
+        max_bytes (int, optional): Reject files larger than this.
+
+    Yields:
+        ProcessTable: Consecutive rows of the workload.
+
+    Raises:
+        IngestError: If rows are malformed, there are none, or a limit is exceeded.
+    """
+    columns = _ColumnBuilder()
+    line_errors = []
+    line_number = 0
+    total_bytes = 0
+    rows = 0
+    tail = b""
+
+    def parse(line):
+        nonlocal rows
+        line = line.strip()
+        if line_number == 1 and line.startswith(b"\xef\xbb\xbf"):
+            line = line[3:]
+        if not line:
+            return
+        try:
+            columns.add_row(line)
+        except (ValueError, UnicodeDecodeError) as e:
+            line_errors.append((line_number, str(e)))
+            if len(line_errors) >= MAX_REPORTED_ERRORS:
+                raise IngestError("Incorrect data format in CSV file", line_errors)
+            return
+        rows += 1
+        if max_rows is not None and rows > max_rows:
+            raise IngestError(f"CSV file has more than {max_rows} rows")
+
+    chunk = stream.read(chunk_size)
+    if is_workload_file(chunk):
+        processes = _read_binary(stream, chunk, chunk_size, max_rows, max_bytes)
+        if not len(processes):
+            raise IngestError("Workload has no processes")
+        if rows_per_table is None:
+            yield processes
+            return
+        for first in range(0, len(processes), rows_per_table):
+            yield processes.slice(first, first + rows_per_table)
+        return
+    while chunk:
+        total_bytes += len(chunk)
+        if max_bytes is not None and total_bytes > max_bytes:
+            raise IngestError(f"CSV file is larger than {max_bytes} bytes")
+        lines = (tail + chunk).split(b"\n")
+        tail = lines.pop()
+        for line in lines:
+            line_number += 1
+            parse(line)
+            if rows_per_table is not None and len(columns.pid_index) >= rows_per_table:
+                if line_errors:
+                    raise IngestError("Incorrect data format in CSV file", line_errors)
+                yield columns.build()
+                columns = _ColumnBuilder()
+        chunk = stream.read(chunk_size)
+    if tail:
+        line_number += 1
+        parse(tail)
+
+    if line_errors:
+        raise IngestError("Incorrect data format in CSV file", line_errors)
+    if not rows:
+        raise IngestError("Workload has no processes")
+    if len(columns.pid_index):
+        yield columns.build()
+
+
+def _read_binary(stream, head, chunk_size, max_rows=None, max_bytes=None):
+    """Load a binary workload whose first bytes, ``head``, were already read.
+
+    Streams backed by a file are memory-mapped; others are read into one buffer
+    that the columns then view without copying.
+    """
+    try:
+        fileno = stream.fileno()
+    except (AttributeError, OSError):
+        fileno = None
+    if fileno is not None:
+        if max_bytes is not None and os.fstat(fileno).st_size > max_bytes:
+            raise IngestError(f"Workload file is larger than {max_bytes} bytes")
+        buffer = mmap.mmap(fileno, 0, access=mmap.ACCESS_READ)
+    else:
+        buffer = bytearray(head)
+        while True:
+            chunk = stream.read(chunk_size)
+            if not chunk:
+                break
+            buffer += chunk
+            if max_bytes is not None and len(buffer) > max_bytes:
+                raise IngestError(f"Workload file is larger than {max_bytes} bytes")
+    try:
+        processes = load_workload(buffer)
+    except ValueError as e:
+        raise IngestError(str(e))
+    if max_rows is not None and len(processes) > max_rows:
+        raise IngestError(f"Workload file has more than {max_rows} rows")
+    return processes
@@ -0,0 +1,136 @@
+from bisect import bisect_left
+from contextlib import contextmanager
+import threading
+import time
+
+# Phases of a request, in the order they usually run
+PHASES = ("parse", "build", "schedule", "metrics", "render", "serialize")
+
+# Upper bounds, in seconds, of the latency histogram buckets
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+
+
+def size_class(count):
+    """Return the input size label of a workload: the next power of ten, e.g. "1e3".
+
+    Args:
+        count (int): Number of processes.
+
+    Returns:
+        str: The label, or "unknown" if the size is not known.
+    """
+    if count is None:
+        return "unknown"
+    exponent = 0
+    while 10 ** exponent < count:
+        exponent += 1
+    return f"1e{exponent}"
+
+
+class PhaseHistograms:
+    """Thread-safe latency histograms of request phases.
+
+    One histogram is kept per (endpoint, phase, algorithm, input size class),
+    and all of them are exported in the Prometheus text format.
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        """Initialize the PhaseHistograms.
+
+        Args:
+            buckets (tuple, optional): Upper bounds of the buckets, in seconds.
+        """
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, endpoint, phase, algorithm, size, seconds):
+        """Record one phase duration.
+
+        Args:
+            endpoint (str): Route that handled the request.
+            phase (str): One of PHASES.
+            algorithm (str): Short name of the algorithm, or "none".
+            size (str): Input size class from size_class().
+            seconds (float): Duration of the phase.
+        """
+        labels = (endpoint, phase, algorithm or "none", size)
+        bucket = bisect_left(self.buckets, seconds)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                # Per-bucket counts plus the running sum and count
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][bucket] += 1
+            series[1] += seconds
+            series[2] += 1
+
+    def render_prometheus(self):
+        """Return every histogram in the Prometheus text exposition format."""
+        lines = [
+            "# HELP scheduler_phase_seconds Time spent in each phase of a request.",
+            "# TYPE scheduler_phase_seconds histogram",
+        ]
+        with self._lock:
+            series = sorted((labels, [list(counts), total, count]) for labels, (counts, total, count) in self._series.items())
+        for (endpoint, phase, algorithm, size), (counts, total, count) in series:
+            labels = f'endpoint="{endpoint}",phase="{phase}",algorithm="{algorithm}",size="{size}"'
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                lines.append(f'scheduler_phase_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'scheduler_phase_seconds_bucket{{{labels},le="+Inf"}} {count}')
+            lines.append(f"scheduler_phase_seconds_sum{{{labels}}} {total}")
+            lines.append(f"scheduler_phase_seconds_count{{{labels}}} {count}")
+        return "\n".join(lines) + "\n"
+
+
+class RequestTimer:
+    """Collects the phase durations of one request.
+
+    The algorithm and input size are usually only known once the input is
+    parsed, so they can be set at any point before finish().
+    """
+
+    def __init__(self, endpoint):
+        """Initialize the RequestTimer.
+
+        Args:
+            endpoint (str): Route handling the request.
+        """
+        self.endpoint = endpoint
+        self.algorithm = None
+        self.size = None
+        self.phases = []
+
+    @contextmanager
+    def phase(self, name, algorithm=None):
+        """Time the enclosed block as phase ``name``.
+
+        Args:
+            name (str): One of PHASES.
+            algorithm (str, optional): Algorithm of this phase, if it differs from the request's.
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - started, algorithm)
+
+    def add(self, name, seconds, algorithm=None):
+        """Record a phase measured elsewhere, e.g. in a worker process."""
+        self.phases.append((name, algorithm, seconds))
+
+    def server_timing(self):
+        """Return the phase breakdown as a Server-Timing header value, in milliseconds."""
+        entries = []
+        for name, algorithm, seconds in self.phases:
+            description = f';desc="{algorithm}"' if algorithm else ""
+            entries.append(f"{name};dur={seconds * 1000:.3f}{description}")
+        return ", ".join(entries)
+
+    def finish(self, histograms):
+        """Record every phase of the request into ``histograms``."""
+        size = size_class(self.size)
+        for name, algorithm, seconds in self.phases:
+            histograms.observe(self.endpoint, name, algorithm or self.algorithm, size, seconds)
@@ -0,0 +1,147 @@
+import numpy as np
+
+
+class ScheduleMetrics:
+    """Per-process metrics of a schedule.
+
+    The metrics are NumPy columns aligned with ``slots``, which lists each
+    process once, in the order it was first dispatched, as an index into the
+    schedule's name table. Python objects are only created for the rows that
+    are read, e.g. through ``pids`` or head().
+    """
+
+    def __init__(self, names, slots, arrival_times, first_start, finish, burst):
+        """Initialize the ScheduleMetrics.
+
+        Args:
+            names (list): Name table of the schedule.
+            slots (numpy.ndarray): Index into ``names`` of each process, in order of first dispatch.
+            arrival_times (numpy.ndarray): Arrival time of each process.
+            first_start (numpy.ndarray): Time each process first got the CPU.
+            finish (numpy.ndarray): Time each process finished.
+            burst (numpy.ndarray): Total CPU time of each process.
+        """
+        self.names = names
+        self.slots = slots
+        self.arrival_times = arrival_times
+        self.first_start = first_start
+        self.finish = finish
+        self.burst = burst
+
+    def __len__(self):
+        """Return the number of processes."""
+        return len(self.slots)
+
+    def head(self, count):
+        """Return the metrics of the first ``count`` processes, as views of these columns."""
+        return ScheduleMetrics(self.names, self.slots[:count], self.arrival_times[:count],
+                               self.first_start[:count], self.finish[:count], self.burst[:count])
+
+    @property
+    def pids(self):
+        """list: Process IDs in order of first dispatch."""
+        names = self.names
+        return [names[slot] for slot in self.slots.tolist()]
+
+    def pid_at(self, index):
+        """Return the process ID of the process at ``index``, without building ``pids``."""
+        return self.names[int(self.slots[index])]
+
+    @property
+    def nbytes(self):
+        """int: Memory held by the metric columns."""
+        return (self.slots.nbytes + self.arrival_times.nbytes + self.first_start.nbytes
+                + self.finish.nbytes + self.burst.nbytes)
+
+    @property
+    def turnaround(self):
+        """numpy.ndarray: Time from arrival to completion of each process."""
+        return self.finish - self.arrival_times
+
+    @property
+    def waiting(self):
+        """numpy.ndarray: Time each process spent ready but not running.
+
+        On a single CPU this is the turnaround time minus the total CPU time.
+        """
+        return self.finish - self.arrival_times - self.burst
+
+    @property
+    def response(self):
+        """numpy.ndarray: Time from arrival to the first dispatch of each process."""
+        return self.first_start - self.arrival_times
+
+    @property
+    def average_waiting_time(self):
+        """float: Mean waiting time over all processes."""
+        return _mean(self.waiting)
+
+    @property
+    def average_turnaround_time(self):
+        """float: Mean turnaround time over all processes."""
+        return _mean(self.turnaround)
+
+    @property
+    def average_response_time(self):
+        """float: Mean response time over all processes."""
+        return _mean(self.response)
+
+
+def _mean(values):
+    """Return the mean of a column, summing integers exactly, or 0.0 if it is empty."""
+    if not len(values):
+        return 0.0
+    return values.sum().item() / len(values)
+
+
+def schedule_metrics(schedule, processes):
+    """Compute per-process metrics from the typed arrays of a Schedule.
+
+    Works on the schedule's columns directly with grouped NumPy reductions, so
+    no per-segment Python objects are created.
+
+    Args:
+        schedule (Schedule): The schedule to measure.
+        processes (ProcessTable): The scheduled workload, sharing the schedule's name table.
+
+    Returns:
+        ScheduleMetrics: First start, finish, total burst, waiting, turnaround and
+            response time of every process.
+    """
+    pid_index = schedule.pid_index
+    first_index = np.full(len(schedule.names), len(pid_index), dtype=np.int64)
+    np.minimum.at(first_index, pid_index, np.arange(len(pid_index)))
+    dispatched = np.flatnonzero(first_index < len(pid_index))
+    # Processes are listed in order of first dispatch
+    slots = dispatched[np.argsort(first_index[dispatched], kind="stable")]
+
+    ends = schedule.end_times
+    finish = np.zeros(len(schedule.names), dtype=ends.dtype)
+    np.maximum.at(finish, pid_index, ends)
+    burst = np.bincount(pid_index, weights=schedule.durations, minlength=len(schedule.names))
+    if burst.dtype.kind == "f" and ends.dtype.kind != "f":
+        burst = burst.astype(np.int64)
+    arrival = np.zeros(len(schedule.names), dtype=processes.arrival_times.dtype)
+    arrival[processes.pid_index] = processes.arrival_times
+
+    return ScheduleMetrics(
+        schedule.names,
+        slots.astype(np.int32),
+        arrival[slots],
+        schedule.start_times[first_index[slots]],
+        finish[slots],
+        burst[slots],
+    )
+
+
+def context_switches(schedule):
+    """Count how often the CPU switches from one process to another.
+
+    Args:
+        schedule (Schedule): The schedule to measure.
+
+    Returns:
+        int: Number of consecutive segments that belong to different processes.
+    """
+    pid_index = schedule.pid_index
+    return int(np.count_nonzero(pid_index[1:] != pid_index[:-1]))
@@ -0,0 +1,107 @@
+from Simulation import ArrivalHeap, Simulation
+
+
+class OnlineState:
+    """Incremental scheduler state fed by a live stream of processes.
+
+    Processes are submitted as they become known and the simulation is
+    advanced to a point in time; every decision taken before that point is
+    final, so submitting a process costs O(log n) and never restarts the
+    schedule. Processes must be submitted with an arrival time no earlier than
+    the current clock, and an algorithm's online schedule then equals its batch
+    schedule of the same processes listed in submission order.
+    """
+
+    def __init__(self, ready_queue, needs_priority=False, merge_slices=False):
+        """Initialize the OnlineState.
+
+        Args:
+            ready_queue (callable): Builds the algorithm's ready-queue policy
+                from the arrival, remaining and priority columns.
+            needs_priority (bool, optional): Whether processes must carry a priority.
+            merge_slices (bool, optional): Merge back-to-back slices of the same process.
+        """
+        self.needs_priority = needs_priority
+        self.merge_slices = merge_slices
+        self.clock = None
+        # Columns of the submitted processes, keyed by submission order; rows
+        # are dropped once their process finishes, so only live ones are kept
+        self.pids = {}
+        self.arrival = {}
+        self.remaining = {}
+        self.priority = {}
+        self.submitted = 0
+        self.arrivals = ArrivalHeap()
+        self.simulation = Simulation(ready_queue(self.arrival, self.remaining, self.priority),
+                                     self.remaining, self.arrivals)
+        self.simulation.on_finish = self._release
+        self._merged = None
+
+    def submit(self, process):
+        """Add a process to the simulation.
+
+        Args:
+            process (Process): The process; its arrival time must not precede the clock.
+        """
+        if self.clock is not None and process.arrival_time < self.clock:
+            raise ValueError(f"Process {process.pid} arrives at {process.arrival_time}, before the current time {self.clock}")
+        if self.needs_priority and process.priority is None:
+            raise ValueError(f"Process {process.pid} has no priority")
+        row = self.submitted
+        self.submitted += 1
+        self.pids[row] = process.pid
+        self.arrival[row] = process.arrival_time
+        self.remaining[row] = process.burst_time
+        self.priority[row] = process.priority
+        self.arrivals.push(process.arrival_time, row)
+
+    def advance(self, until_time):
+        """Take every scheduling decision due strictly before ``until_time``.
+
+        Args:
+            until_time (int): New value of the clock.
+
+        Returns:
+            list: (process ID, start time, duration) of the segments dispatched.
+        """
+        if self.clock is not None and until_time < self.clock:
+            raise ValueError(f"Cannot move the clock back from {self.clock} to {until_time}")
+        self.clock = until_time
+        segments = []
+        for row, start, duration in self.simulation.run(until_time):
+            self._emit(segments, row, start, duration)
+        return segments
+
+    def drain(self):
+        """Run every submitted process to completion.
+
+        Returns:
+            list: (process ID, start time, duration) of the remaining segments.
+        """
+        segments = self.advance(float("inf"))
+        self._flush(segments)
+        return segments
+
+    @property
+    def live(self):
+        """int: Number of submitted processes that have not finished."""
+        return len(self.pids)
+
+    def _emit(self, segments, row, start, duration):
+        if not self.merge_slices:
+            segments.append((self.pids[row], start, duration))
+        elif self._merged is not None and self._merged[0] == row:
+            self._merged[3] += duration
+        else:
+            self._flush(segments)
+            self._merged = [row, self.pids[row], start, duration]
+
+    def _flush(self, segments):
+        if self._merged is not None:
+            _, pid, start, duration = self._merged
+            segments.append((pid, start, duration))
+            self._merged = None
+
+    def _release(self, row):
+        """Forget a finished process."""
+        del self.pids[row], self.arrival[row], self.remaining[row], self.priority[row]
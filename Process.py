@@ -1,5 +1,11 @@
 class Process:
-    """Process class representing a process for scheduling."""
+    """Process class representing a process for scheduling.
+
+    Large workloads are stored column-wise in a ProcessTable; a Process is the
+    row view of a single process and keeps no per-instance ``__dict__``.
+    """
+
+    __slots__ = ("pid", "arrival_time", "burst_time", "remaining_time", "start_time", "waiting_time", "turnaround_time", "priority")
 
     def __init__(self, pid=None, arrival_time=None, burst_time=None, priority=None):
         """Initialize the Process.
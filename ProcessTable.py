@@ -0,0 +1,196 @@
+import sys
+
+import numpy as np
+
+from Process import Process
+
+# Stored in the priority column for rows that have no priority
+MISSING_PRIORITY = np.iinfo(np.int64).min
+
+
+def _column(values, dtype=None):
+    """Convert a sequence of numbers into a contiguous NumPy column."""
+    column = np.ascontiguousarray(values, dtype=dtype)
+    if column.dtype.kind not in "iuf":
+        column = column.astype(np.int64)
+    return column
+
+
+class ProcessTable:
+    """Columnar table of processes backed by contiguous typed arrays.
+
+    Each pid is stored once in an interned name table, and every row refers to
+    it through ``pid_index``. Arrival, burst, priority and remaining times are
+    kept in NumPy arrays instead of one ``Process`` object per row.
+    """
+
+    def __init__(self, pids, arrival_times, burst_times, priorities=None):
+        """Initialize the ProcessTable.
+
+        Args:
+            pids (list): Process ID of each row.
+            arrival_times (array-like): Arrival time of each row.
+            burst_times (array-like): Burst time of each row.
+            priorities (array-like, optional): Priority of each row, or None if
+                the workload has no priorities. Rows without a priority hold
+                MISSING_PRIORITY.
+        """
+        index = {}
+        pid_index = []
+        for pid in pids:
+            if isinstance(pid, str):
+                pid = sys.intern(pid)
+            pid_index.append(index.setdefault(pid, len(index)))
+        self.names = list(index)
+        self.pid_index = np.array(pid_index, dtype=np.int32)
+        self.arrival_times = _column(arrival_times)
+        self.burst_times = _column(burst_times)
+        self.remaining_times = self.burst_times.copy()
+        self.priorities = None if priorities is None else _column(priorities, np.int64)
+        if not len(self.pid_index) == len(self.arrival_times) == len(self.burst_times):
+            raise ValueError("Process columns must all have the same length")
+        if self.priorities is not None and len(self.priorities) != len(self.pid_index):
+            raise ValueError("Process columns must all have the same length")
+
+    @classmethod
+    def from_columns(cls, names, pid_index, arrival_times, burst_times, priorities=None):
+        """Build a table from columns that already use an interned name table.
+
+        The columns are wrapped without copying when they are already contiguous
+        arrays of a numeric type.
+
+        Args:
+            names (list): Distinct process IDs.
+            pid_index (array-like): Index into ``names`` of each row.
+            arrival_times (array-like): Arrival time of each row.
+            burst_times (array-like): Burst time of each row.
+            priorities (array-like, optional): Priority of each row, or None.
+
+        Returns:
+            ProcessTable: The table.
+        """
+        table = cls.__new__(cls)
+        table.names = names
+        table.pid_index = _column(pid_index, np.int32)
+        table.arrival_times = _column(arrival_times)
+        table.burst_times = _column(burst_times)
+        table._remaining_times = None
+        table.priorities = None if priorities is None else _column(priorities, np.int64)
+        return table
+
+    @classmethod
+    def from_processes(cls, processes):
+        """Build a table from a list of Process objects.
+
+        Args:
+            processes (list): List of Process objects.
+
+        Returns:
+            ProcessTable: The equivalent table.
+        """
+        table = cls(
+            [process.pid for process in processes],
+            [process.arrival_time for process in processes],
+            [process.burst_time for process in processes],
+            _priority_column([process.priority for process in processes]),
+        )
+        table.remaining_times = _column([process.remaining_time for process in processes], table.burst_times.dtype)
+        return table
+
+    def slice(self, start, stop):
+        """Return rows ``start`` to ``stop`` as a table sharing this table's columns and names.
+
+        Args:
+            start (int): First row.
+            stop (int): Row after the last one.
+
+        Returns:
+            ProcessTable: The rows, as views of the columns.
+        """
+        return ProcessTable.from_columns(
+            self.names,
+            self.pid_index[start:stop],
+            self.arrival_times[start:stop],
+            self.burst_times[start:stop],
+            None if self.priorities is None else self.priorities[start:stop],
+        )
+
+    def __len__(self):
+        """Return the number of processes in the table."""
+        return len(self.pid_index)
+
+    def __getitem__(self, i):
+        """Return row ``i`` as a Process."""
+        process = Process(
+            self.names[self.pid_index[i]],
+            self.arrival_times[i].item(),
+            self.burst_times[i].item(),
+            None if self.priorities is None else _priority_value(self.priorities[i].item()),
+        )
+        process.remaining_time = self.remaining_times[i].item()
+        return process
+
+    def __iter__(self):
+        """Iterate over the rows as Process objects."""
+        for i in range(len(self)):
+            yield self[i]
+
+    @property
+    def remaining_times(self):
+        """numpy.ndarray: Remaining time of each row, copied from the burst times on first use."""
+        if self._remaining_times is None:
+            self._remaining_times = self.burst_times.copy()
+        return self._remaining_times
+
+    @remaining_times.setter
+    def remaining_times(self, values):
+        self._remaining_times = values
+
+    @property
+    def pids(self):
+        """list: Process ID of each row."""
+        names = self.names
+        return [names[i] for i in self.pid_index.tolist()]
+
+    def priority_values(self):
+        """Return the priority of each row as a list, with None for the rows that have none."""
+        if self.priorities is None:
+            return [None] * len(self)
+        return [_priority_value(priority) for priority in self.priorities.tolist()]
+
+    def require_priorities(self, algorithm):
+        """Return the priority column, raising if any process has no priority.
+
+        Args:
+            algorithm (str): Name of the algorithm that needs priorities.
+
+        Returns:
+            numpy.ndarray: The priority column.
+        """
+        if self.priorities is None:
+            raise ValueError(f"{algorithm} requires a priority for every process")
+        missing = np.flatnonzero(self.priorities == MISSING_PRIORITY)
+        if len(missing):
+            row = missing[0].item()
+            raise ValueError(f"{algorithm} requires a priority for every process, "
+                             f"but process {self.names[self.pid_index[row]]} on row {row + 1} has none")
+        return self.priorities
+
+
+def _priority_column(priorities):
+    """Return the priorities with MISSING_PRIORITY for the missing ones, or None if no row has one."""
+    if all(priority is None for priority in priorities):
+        return None
+    return [MISSING_PRIORITY if priority is None else int(priority) for priority in priorities]
+
+
+def _priority_value(priority):
+    """Return a stored priority, or None if it is MISSING_PRIORITY."""
+    return None if priority == MISSING_PRIORITY else priority
+
+
+def as_process_table(processes):
+    """Return ``processes`` as a ProcessTable, converting a list of Process objects if needed."""
+    if isinstance(processes, ProcessTable):
+        return processes
+    return ProcessTable.from_processes(processes)
@@ -0,0 +1,239 @@
+"""Replay arrival-sorted traces that do not fit in memory.
+
+The trace is read a window of rows at a time and fed to the online mode of a
+scheduling algorithm. Finished processes are folded into running aggregate
+metrics, and segments are optionally written to a file as they are produced,
+so memory depends on the window and on how many processes are ready at once,
+not on the length of the trace.
+
+Usage:
+    python Replay.py trace.csv --algorithm RR --quantum 4 --segments segments.csv
+"""
+import argparse
+import sys
+
+from Ingest import iter_workload
+from Process import Process
+from SchedulingAlgorithm import ALGORITHMS, make_algorithm
+
+# Rows read from the trace and submitted before the simulation is advanced
+DEFAULT_WINDOW = 65536
+
+PERCENTILES = (50, 90, 99)
+
+# Values below this are counted exactly; larger ones in buckets of relative width 1/SUB_BUCKETS
+SUB_BUCKETS = 128
+
+
+class StreamingHistogram:
+    """Fixed-precision histogram of non-negative integers for streaming percentiles.
+
+    Small values are counted exactly and larger ones in log-linear buckets,
+    so percentiles are within 1% of the exact value while the number of
+    buckets stays bounded by the logarithm of the largest value.
+    """
+
+    def __init__(self):
+        """Initialize the StreamingHistogram."""
+        self.buckets = {}
+        self.count = 0
+
+    def add(self, value):
+        """Count one value."""
+        if value < SUB_BUCKETS:
+            key = value
+        else:
+            shift = value.bit_length() - SUB_BUCKETS.bit_length()
+            key = (shift + 1) * SUB_BUCKETS + (value >> shift) - SUB_BUCKETS
+        self.buckets[key] = self.buckets.get(key, 0) + 1
+        self.count += 1
+
+    def percentile(self, q):
+        """Return the nearest-rank ``q``-th percentile, or None if no value was counted.
+
+        Args:
+            q (float): Percentile between 0 and 100.
+        """
+        if not self.count:
+            return None
+        rank = max(1, -(-q * self.count // 100))
+        seen = 0
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if seen >= rank:
+                break
+        if key < SUB_BUCKETS:
+            return key
+        shift = key // SUB_BUCKETS - 1
+        mantissa = key % SUB_BUCKETS + SUB_BUCKETS
+        # Middle of the bucket
+        return ((mantissa << shift) + ((mantissa + 1) << shift) - 1) / 2
+
+
+class ReplayMetrics:
+    """Aggregate metrics of a replayed trace, updated as processes finish."""
+
+    def __init__(self):
+        """Initialize the ReplayMetrics."""
+        self.processes = 0
+        self.segments = 0
+        self.context_switches = 0
+        self.busy_time = 0
+        self.first_arrival = None
+        self.last_finish = None
+        # Largest number of processes held by the simulation at once
+        self.peak_live = 0
+        self.totals = {"waiting": 0, "turnaround": 0, "response": 0}
+        self.histograms = {name: StreamingHistogram() for name in self.totals}
+        # (arrival, burst, CPU time received, first start) of the unfinished processes
+        self._running = {}
+        self._last_pid = None
+
+    @property
+    def average_waiting_time(self):
+        """float: Mean waiting time over the finished processes."""
+        return self.totals["waiting"] / self.processes
+
+    @property
+    def average_turnaround_time(self):
+        """float: Mean turnaround time over the finished processes."""
+        return self.totals["turnaround"] / self.processes
+
+    @property
+    def average_response_time(self):
+        """float: Mean response time over the finished processes."""
+        return self.totals["response"] / self.processes
+
+    @property
+    def utilization(self):
+        """float: Fraction of the time between the first arrival and the last completion the CPU was busy."""
+        span = self.last_finish - self.first_arrival
+        return self.busy_time / span if span else 1.0
+
+    def percentile(self, metric, q):
+        """Return the ``q``-th percentile of "waiting", "turnaround" or "response" times."""
+        return self.histograms[metric].percentile(q)
+
+    def summary(self, percentiles=PERCENTILES):
+        """Return the metrics as a dict.
+
+        Args:
+            percentiles (tuple, optional): Percentiles reported for every metric.
+        """
+        summary = {
+            "processes": self.processes,
+            "segments": self.segments,
+            "context_switches": self.context_switches,
+            "utilization": self.utilization,
+            "peak_live_processes": self.peak_live,
+        }
+        for metric in self.totals:
+            summary[f"average_{metric}_time"] = self.totals[metric] / self.processes
+            for q in percentiles:
+                summary[f"p{q}_{metric}_time"] = self.percentile(metric, q)
+        return summary
+
+    def arrived(self, pid, arrival_time, burst_time):
+        """Start tracking a submitted process."""
+        if pid in self._running:
+            raise ValueError(f"Process {pid} is submitted again before it finished")
+        if self.first_arrival is None:
+            self.first_arrival = arrival_time
+        self._running[pid] = [arrival_time, burst_time, 0, None]
+
+    def fold(self, segments):
+        """Account for dispatched segments, folding finished processes into the aggregates."""
+        running = self._running
+        for pid, start, duration in segments:
+            self.segments += 1
+            if pid != self._last_pid:
+                if self._last_pid is not None:
+                    self.context_switches += 1
+                self._last_pid = pid
+            self.busy_time += duration
+            state = running[pid]
+            if state[3] is None:
+                state[3] = start
+            state[2] += duration
+            if state[2] >= state[1]:
+                del running[pid]
+                self._finish(state, start + duration)
+
+    def _finish(self, state, finish):
+        arrival_time, burst_time, _, first_start = state
+        turnaround = finish - arrival_time
+        for metric, value in (("waiting", turnaround - burst_time), ("turnaround", turnaround),
+                              ("response", first_start - arrival_time)):
+            self.totals[metric] += value
+            self.histograms[metric].add(value)
+        self.processes += 1
+        if self.last_finish is None or finish > self.last_finish:
+            self.last_finish = finish
+
+
+def replay(source, algorithm, window=DEFAULT_WINDOW, segments_out=None):
+    """Schedule an arrival-sorted trace on disk with bounded memory.
+
+    Args:
+        source: Path of a CSV or binary workload file, or a binary stream.
+        algorithm (SchedulingAlgorithm): The algorithm; its online mode runs the trace.
+        window (int, optional): Rows read and submitted between two advances of the clock.
+        segments_out: Optional path or text stream the (pid, start, duration)
+            segments are written to as CSV lines.
+
+    Returns:
+        ReplayMetrics: The aggregate metrics.
+
+    Raises:
+        ValueError: If the trace is empty or not sorted by arrival time.
+    """
+    if isinstance(source, str):
+        with open(source, "rb") as stream:
+            return replay(stream, algorithm, window, segments_out)
+    if isinstance(segments_out, str):
+        with open(segments_out, "w") as out:
+            return replay(source, algorithm, window, out)
+
+    state = algorithm.online()
+    metrics = ReplayMetrics()
+
+    def fold(segments):
+        metrics.fold(segments)
+        if segments_out is not None:
+            segments_out.writelines(f"{pid},{start},{duration}\n" for pid, start, duration in segments)
+
+    row = 0
+    last_arrival = None
+    for table in iter_workload(source, window):
+        arrival_times = table.arrival_times.tolist()
+        for pid, arrival_time, burst_time, priority in zip(table.pids, arrival_times, table.burst_times.tolist(),
+                                                           table.priority_values()):
+            if last_arrival is not None and arrival_time < last_arrival:
+                raise ValueError(f"Trace is not sorted by arrival time at row {row + 1}")
+            last_arrival = arrival_time
+            row += 1
+            metrics.arrived(pid, arrival_time, burst_time)
+            state.submit(Process(pid, arrival_time, burst_time, priority))
+        metrics.peak_live = max(metrics.peak_live, state.live)
+        fold(state.advance(last_arrival))
+    fold(state.drain())
+    return metrics
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("trace", help="arrival-sorted CSV or binary workload file")
+    parser.add_argument("--algorithm", default="FCFS", choices=list(ALGORITHMS))
+    parser.add_argument("--quantum", type=int, help="time quantum of the round robin algorithms")
+    parser.add_argument("--window", type=int, default=DEFAULT_WINDOW, help="rows read at a time")
+    parser.add_argument("--segments", metavar="PATH", help="write the segments to this CSV file")
+    args = parser.parse_args(argv)
+
+    metrics = replay(args.trace, make_algorithm(args.algorithm, args.quantum), args.window, args.segments)
+    for name, value in metrics.summary().items():
+        print(f"{name:28s} {value}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,230 @@
+from collections import OrderedDict
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+
+import numpy as np
+
+from Generator import SequentialNames
+from SchedulingAlgorithm import QUANTUM_ALGORITHMS
+from WorkloadFile import NameTable
+
+# Default size bounds of the in-memory and on-disk tiers
+DEFAULT_MAX_BYTES = 512 * 1024 ** 2
+DEFAULT_MAX_DISK_BYTES = 1024 ** 3
+
+# Bytes charged per in-memory entry on top of its arrays, covering small values such as summaries
+ENTRY_OVERHEAD = 1024
+
+
+def workload_digest(processes):
+    """Return a content hash of a workload.
+
+    The columns are hashed in a normalized form (fixed dtypes), so equal
+    workloads hash equally however their columns were built. The name table
+    of a binary workload is hashed as its raw offsets and bytes, and that of a
+    generated one by its first ID and count, without formatting a single pid;
+    they therefore hash differently from the same workload parsed from CSV,
+    which only costs a cache miss.
+
+    Args:
+        processes (ProcessTable): The workload.
+
+    Returns:
+        str: Hex digest identifying the workload.
+    """
+    digest = hashlib.sha256()
+    names = processes.names
+    if isinstance(names, NameTable):
+        digest.update(b"name table")
+        digest.update(np.ascontiguousarray(names.offsets, dtype=np.uint64).tobytes())
+        digest.update(memoryview(names.data))
+    elif isinstance(names, SequentialNames):
+        digest.update(f"sequential names {names.start} {names.count}".encode("ascii"))
+    else:
+        digest.update("\0".join(str(name) for name in names).encode("utf-8"))
+    digest.update(np.ascontiguousarray(processes.pid_index, dtype=np.int64).tobytes())
+    for column in (processes.arrival_times, processes.burst_times, processes.priorities):
+        if column is None:
+            digest.update(b"none")
+            continue
+        dtype = np.float64 if column.dtype.kind == "f" else np.int64
+        digest.update(np.dtype(dtype).str.encode())
+        digest.update(np.ascontiguousarray(column, dtype=dtype).tobytes())
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """Content-addressed LRU cache of scheduling results.
+
+    Entries live in an in-memory LRU bounded by ``max_bytes``, counting the
+    NumPy columns of each cached schedule and metrics, and optionally in a
+    directory on disk that survives restarts and is shared between worker
+    processes. The disk tier is bounded too: once its files exceed
+    ``max_disk_bytes``, the least recently used ones (by modification time,
+    refreshed on every disk hit) are deleted.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, directory=None, max_disk_bytes=DEFAULT_MAX_DISK_BYTES):
+        """Initialize the ResultCache.
+
+        Args:
+            max_bytes (int, optional): Total size of the entries kept in memory.
+            directory (str, optional): Directory for the on-disk tier. Disabled if None.
+            max_disk_bytes (int, optional): Total size of the on-disk tier.
+        """
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.directory = directory
+        self.max_disk_bytes = max_disk_bytes
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def make_key(digest, algorithm, quantum=None, kind="schedule"):
+        """Build the cache key of one algorithm run.
+
+        Args:
+            digest (str): Workload digest from workload_digest().
+            algorithm (str): Short name of the algorithm.
+            quantum (int, optional): Time quantum; ignored by algorithms that do not use one.
+            kind (str, optional): What is cached, so different result shapes never collide.
+
+        Returns:
+            str: The cache key.
+        """
+        quantum = int(quantum) if algorithm in QUANTUM_ALGORITHMS else None
+        return f"{kind}-{algorithm}-{quantum}-{digest}"
+
+    def get(self, key):
+        """Return the cached value for ``key``, or None on a miss."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+        value = self._read_disk(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.disk_hits += 1
+            self._store(key, value)
+        return value
+
+    def put(self, key, value):
+        """Store ``value`` under ``key`` in memory and, if enabled, on disk."""
+        with self._lock:
+            self._store(key, value)
+        self._write_disk(key, value)
+
+    def stats(self):
+        """Return the hit and miss counters.
+
+        Returns:
+            dict: Hits, disk hits, misses, and the number and size of the entries in memory.
+        """
+        with self._lock:
+            return {"hits": self.hits, "disk_hits": self.disk_hits, "misses": self.misses,
+                    "entries": len(self._entries), "bytes": self.nbytes}
+
+    def clear(self):
+        """Drop every in-memory entry and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+            self.hits = self.misses = self.disk_hits = 0
+
+    def _store(self, key, value):
+        size = _value_nbytes(value)
+        if key in self._entries:
+            self.nbytes -= self._entries.pop(key)[1]
+        if size > self.max_bytes:
+            # Larger than the whole tier; it would only evict everything else
+            return
+        self._entries[key] = (value, size)
+        self.nbytes += size
+        while self.nbytes > self.max_bytes:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self.nbytes -= evicted
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.pkl")
+
+    def _read_disk(self, key):
+        if self.directory is None:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+        try:
+            # Mark the entry as recently used so pruning keeps it
+            os.utime(path)
+        except OSError:
+            pass
+        return value
+
+    def _write_disk(self, key, value):
+        if self.directory is None:
+            return
+        # Write to a temporary file first so readers never see a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._path(key))
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+        self._prune_disk()
+
+    def _prune_disk(self):
+        """Delete the least recently used disk entries until the tier fits in max_disk_bytes."""
+        entries = []
+        total = 0
+        with os.scandir(self.directory) as scan:
+            for entry in scan:
+                if not entry.name.endswith(".pkl"):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+        if total <= self.max_disk_bytes:
+            return
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                # Already removed by another worker
+                pass
+            total -= size
+
+
+def _value_nbytes(value):
+    """Estimate the memory held by a cached value.
+
+    Tuples are summed, and objects with an ``nbytes`` attribute (schedules,
+    metrics and arrays) count their columns. Name tables are shared with the
+    workload and not counted.
+    """
+    if isinstance(value, tuple):
+        return sum(_value_nbytes(item) for item in value)
+    return int(getattr(value, "nbytes", 0)) + ENTRY_OVERHEAD
@@ -0,0 +1,134 @@
+from collections import OrderedDict
+import os
+import pickle
+import tempfile
+import threading
+import uuid
+
+
+def new_run_id():
+    """Return a fresh, unguessable run id."""
+    return uuid.uuid4().hex
+
+
+class MemoryResultStore:
+    """Per-run result store kept in the memory of one process.
+
+    Only the most recent ``max_runs`` runs are kept.
+    """
+
+    def __init__(self, max_runs=256):
+        """Initialize the MemoryResultStore.
+
+        Args:
+            max_runs (int, optional): Number of runs kept before the oldest are dropped.
+        """
+        self.max_runs = max_runs
+        self._runs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def save(self, result):
+        """Store the result of a run.
+
+        Args:
+            result: Picklable description of the run.
+
+        Returns:
+            str: The run id to load it with.
+        """
+        run_id = new_run_id()
+        with self._lock:
+            self._runs[run_id] = result
+            while len(self._runs) > self.max_runs:
+                self._runs.popitem(last=False)
+        return run_id
+
+    def load(self, run_id):
+        """Return the result stored under ``run_id``, or None if unknown or expired."""
+        with self._lock:
+            return self._runs.get(run_id)
+
+
+class FileResultStore:
+    """Per-run result store kept as files in a directory.
+
+    Every worker process pointing at the same directory (for example on a
+    shared volume or tmpfs such as /dev/shm) sees the same runs, so requests
+    can be load balanced across Flask/Gunicorn workers. Like the in-memory
+    store, only the most recent ``max_runs`` runs are kept.
+    """
+
+    def __init__(self, directory, max_runs=256):
+        """Initialize the FileResultStore.
+
+        Args:
+            directory (str): Directory holding one file per run.
+            max_runs (int, optional): Number of runs kept before the oldest are deleted.
+        """
+        self.directory = directory
+        self.max_runs = max_runs
+        os.makedirs(directory, exist_ok=True)
+
+    def save(self, result):
+        """Store the result of a run.
+
+        Args:
+            result: Picklable description of the run.
+
+        Returns:
+            str: The run id to load it with.
+        """
+        run_id = new_run_id()
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._path(run_id))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self._prune()
+        return run_id
+
+    def load(self, run_id):
+        """Return the result stored under ``run_id``, or None if unknown."""
+        # Run ids are hex strings; anything else could escape the directory
+        if not run_id or not all(c in "0123456789abcdef" for c in run_id):
+            return None
+        try:
+            with open(self._path(run_id), "rb") as f:
+                return pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+
+    def _path(self, run_id):
+        return os.path.join(self.directory, f"{run_id}.pkl")
+
+    def _prune(self):
+        """Delete the oldest runs beyond max_runs."""
+        runs = []
+        with os.scandir(self.directory) as scan:
+            for entry in scan:
+                if not entry.name.endswith(".pkl"):
+                    continue
+                try:
+                    runs.append((entry.stat().st_mtime, entry.path))
+                except OSError:
+                    continue
+        if len(runs) <= self.max_runs:
+            return
+        runs.sort()
+        for _, path in runs[:len(runs) - self.max_runs]:
+            try:
+                os.remove(path)
+            except OSError:
+                # Already removed by another worker
+                pass
+
+
+def make_result_store(directory=None, max_runs=256):
+    """Create the file-backed store if ``directory`` is set, else the in-memory one."""
+    if directory:
+        return FileResultStore(directory, max_runs)
+    return MemoryResultStore(max_runs)
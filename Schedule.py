@@ -0,0 +1,131 @@
+from array import array
+
+import numpy as np
+
+
+def _smallest_dtype(values):
+    """Return the narrowest integer dtype holding every value, or the float dtype for float columns."""
+    if values.dtype.kind == "f":
+        return values.dtype
+    if len(values) == 0:
+        return np.dtype(np.int32)
+    low, high = int(values.min()), int(values.max())
+    for dtype in (np.int8, np.int16, np.int32, np.int64):
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return np.dtype(dtype)
+    return np.dtype(np.int64)
+
+
+def _index_dtype(count):
+    """Return the narrowest integer dtype indexing ``count`` names."""
+    return _smallest_dtype(np.array([0, max(count - 1, 0)]))
+
+
+class Schedule:
+    """Result of a scheduling algorithm backed by typed arrays.
+
+    Each segment is stored as an index into the interned name table plus a
+    start time and a duration, in the smallest integer type that fits, so
+    very long schedules (such as round robin with a small quantum) stay
+    compact. Unpacking a Schedule yields the classic
+    ``(process_names, start_times, durations)`` lists::
+
+        names, start_times, durations = scheduler.run()
+    """
+
+    def __init__(self, names, pid_index, start_times, durations):
+        """Initialize the Schedule.
+
+        Args:
+            names (list): Distinct process IDs.
+            pid_index (array-like): Index into ``names`` of each segment.
+            start_times (array-like): Start time of each segment.
+            durations (array-like): Duration of each segment.
+        """
+        pid_index = np.asarray(pid_index)
+        start_times = np.asarray(start_times)
+        durations = np.asarray(durations)
+        if not len(pid_index) == len(start_times) == len(durations):
+            raise ValueError("Schedule columns must all have the same length")
+        self.names = names
+        self.pid_index = np.ascontiguousarray(pid_index, dtype=_index_dtype(len(names)))
+        self.start_times = np.ascontiguousarray(start_times, dtype=_smallest_dtype(start_times))
+        self.durations = np.ascontiguousarray(durations, dtype=_smallest_dtype(durations))
+
+    @classmethod
+    def from_rows(cls, table, rows, start_times, durations):
+        """Build a schedule whose segments refer to rows of a ProcessTable.
+
+        Args:
+            table (ProcessTable): The scheduled workload.
+            rows (array-like): Table row of each segment.
+            start_times (array-like): Start time of each segment.
+            durations (array-like): Duration of each segment.
+
+        Returns:
+            Schedule: The schedule, sharing the table's name table.
+        """
+        rows = _as_array(rows).astype(np.intp, copy=False)
+        return cls(table.names, table.pid_index[rows], _as_array(start_times), _as_array(durations))
+
+    def __len__(self):
+        """Return the number of segments."""
+        return len(self.pid_index)
+
+    def __iter__(self):
+        """Yield process names, start times and durations as lists, for tuple unpacking."""
+        yield self.process_names
+        yield self.start_times.tolist()
+        yield self.durations.tolist()
+
+    @property
+    def process_names(self):
+        """list: Process ID of each segment."""
+        names = self.names
+        return [names[i] for i in self.pid_index.tolist()]
+
+    @property
+    def end_times(self):
+        """numpy.ndarray: End time of each segment."""
+        return np.add(self.start_times, self.durations, dtype=np.result_type(self.start_times, self.durations, np.int64))
+
+    @property
+    def nbytes(self):
+        """int: Bytes held by the segment arrays."""
+        return self.pid_index.nbytes + self.start_times.nbytes + self.durations.nbytes
+
+    def merged(self):
+        """Return a copy where back-to-back segments of the same process are merged.
+
+        Returns:
+            Schedule: The schedule with consecutive slices joined into one segment.
+        """
+        if len(self) == 0:
+            return self
+        ends = self.end_times[:-1]
+        continues = (self.pid_index[1:] == self.pid_index[:-1]) & (self.start_times[1:] == ends)
+        first = np.flatnonzero(np.concatenate(([True], ~continues)))
+        # Sum in 64 bits, merged durations can outgrow the narrow per-slice type
+        durations = np.add.reduceat(self.durations, first, dtype=np.result_type(self.durations, np.int64))
+        return Schedule(self.names, self.pid_index[first], self.start_times[first], durations)
+
+
+def time_buffer(table):
+    """Return an empty typed buffer for the start times or durations of a table's schedule.
+
+    Args:
+        table (ProcessTable): The workload being scheduled.
+
+    Returns:
+        array.array: A float buffer if the table has float times, else a 64-bit integer one.
+    """
+    kind = np.result_type(table.arrival_times, table.burst_times).kind
+    return array("d" if kind == "f" else "q")
+
+
+def _as_array(values):
+    """Wrap an array.array without copying, or convert any other sequence."""
+    if isinstance(values, array):
+        return np.frombuffer(values, dtype=values.typecode) if len(values) else np.zeros(0, dtype=values.typecode)
+    return np.asarray(values)
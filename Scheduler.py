@@ -1,3 +1,6 @@
+from Replay import DEFAULT_WINDOW, replay
+
+
 class Scheduler:
     """Scheduler class for executing scheduling algorithms."""
 
@@ -5,6 +8,7 @@ class Scheduler:
         """Initialize the Scheduler."""
         self.algorithm = None
         self.processes = []
+        self.online_state = None
         
     def set_algorithm(self, algorithm):
         """Set the scheduling algorithm.
@@ -13,6 +17,7 @@ class Scheduler:
             algorithm (SchedulingAlgorithm): An instance of a scheduling algorithm.
         """
         self.algorithm = algorithm
+        self.online_state = None
         
     def get_algorithm(self):
         """Get the currently set scheduling algorithm.
@@ -26,16 +31,94 @@ class Scheduler:
         """Set the processes to be scheduled.
 
         Args:
-            processes (list): List of Process objects to be scheduled.
+            processes (list or ProcessTable): List of Process objects, or a
+                ProcessTable holding the same columns, to be scheduled.
         """
         self.processes = processes
 
+    def run_iter(self):
+        """Run the scheduling algorithm lazily.
+
+        Segments are produced as the simulation advances, so they can be
+        written out, folded into running metrics or streamed to a client
+        without holding the whole schedule in memory.
+
+        Yields:
+            tuple: (process ID, start time, duration) of each segment.
+        """
+        if self.algorithm is None:
+            raise ValueError("No scheduling algorithm set")
+        return self.algorithm.segments(self.processes)
+
     def run(self):
         """Run the scheduling algorithm.
 
+        Collects the same segments as run_iter() into a compact Schedule.
+
         Returns:
-            tuple: A tuple containing lists of process names, start times, and durations.
+            Schedule: The schedule. It unpacks like the classic tuple of process
+                names, start times and durations lists.
         """
         if self.algorithm is None:
             raise ValueError("No scheduling algorithm set")
         return self.algorithm.schedule(self.processes)
+
+    def replay(self, source, window=DEFAULT_WINDOW, segments_out=None):
+        """Replay an arrival-sorted trace on disk with bounded memory.
+
+        The trace is streamed through the algorithm's online mode and finished
+        processes are folded into aggregate metrics, so traces larger than
+        memory can be scheduled. The processes set with set_processes() are
+        not used.
+
+        Args:
+            source: Path of a CSV or binary workload file, or a binary stream.
+            window (int, optional): Rows read at a time.
+            segments_out: Optional path or text stream the segments are written to.
+
+        Returns:
+            ReplayMetrics: Means, percentiles, utilization and context switches.
+        """
+        if self.algorithm is None:
+            raise ValueError("No scheduling algorithm set")
+        return replay(source, self.algorithm, window, segments_out)
+
+    def submit(self, process):
+        """Submit a process to the online scheduler.
+
+        The online mode keeps the ready queues and the running process between
+        calls, so each submission costs O(log n) and nothing is rescheduled
+        from time zero. Its segments are the same as run() on the submitted
+        processes, in submission order.
+
+        Args:
+            process (Process): The process. Its arrival time must not precede
+                the time the scheduler was last advanced to.
+        """
+        self._online().submit(process)
+
+    def advance(self, until_time):
+        """Advance the online scheduler, taking every decision due before ``until_time``.
+
+        Args:
+            until_time (int): Time to advance to.
+
+        Returns:
+            list: (process ID, start time, duration) of the segments dispatched.
+        """
+        return self._online().advance(until_time)
+
+    def drain(self):
+        """Run every submitted process to completion.
+
+        Returns:
+            list: (process ID, start time, duration) of the remaining segments.
+        """
+        return self._online().drain()
+
+    def _online(self):
+        if self.algorithm is None:
+            raise ValueError("No scheduling algorithm set")
+        if self.online_state is None:
+            self.online_state = self.algorithm.online()
+        return self.online_state
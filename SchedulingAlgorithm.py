@@ -1,293 +1,325 @@
 from abc import ABC, abstractmethod
+from array import array
+
+import numpy as np
+
+from OnlineScheduling import OnlineState
+from ProcessTable import as_process_table
+from Schedule import Schedule, time_buffer
+from Simulation import FeedbackQueue, FIFOQueue, KeyedQueue, LevelQueue, Simulation, SortedArrivals, merge_segments
+
+# Default number of MLFQ levels; the slice doubles from one level to the next
+MLFQ_LEVELS = 3
+
+# Default time between MLFQ priority boosts, in base quanta
+MLFQ_BOOST_QUANTA = 50
 
 class SchedulingAlgorithm(ABC):
-    """Abstract base class for scheduling algorithms."""
+    """Abstract base class for scheduling algorithms.
+
+    An algorithm is a ready-queue policy on top of the shared discrete-event
+    kernel (see Simulation): subclasses implement ``ready_queue``, and the
+    kernel handles arrivals, slice ends and idle periods. ``segments``
+    streams the resulting schedule one segment at a time and ``schedule``
+    collects it into a Schedule.
+    """
+
+    # Whether every process must carry a priority
+    needs_priority = False
+
+    # Whether back-to-back slices of the same process are merged
+    merge_slices = False
 
     def __init__(self):
         pass
-    
+
     @abstractmethod
-    def schedule(self, processes):
-        """Abstract method to schedule processes."""
+    def ready_queue(self, arrival, remaining, priority):
+        """Create the ready-queue policy of the algorithm.
+
+        Args:
+            arrival: Arrival time of each row (list or dict).
+            remaining: Remaining time of each row, kept up to date by the kernel.
+            priority: Priority of each row, or None if the workload has none.
+
+        Returns:
+            ReadyQueue: An empty ready queue.
+        """
         raise NotImplementedError
 
+    def simulation(self, processes):
+        """Create a simulation of a whole workload.
+
+        Args:
+            processes (list or ProcessTable): Processes to be scheduled.
+
+        Returns:
+            Simulation: The simulation; its ``run()`` generates the (row, start
+                time, duration) slices, and its counters describe the run.
+        """
+        table = as_process_table(processes)
+        arrival = table.arrival_times.tolist()
+        remaining = table.burst_times.tolist()
+        priority = table.require_priorities(self.name).tolist() if self.needs_priority else None
+        order = np.argsort(table.arrival_times, kind="stable").tolist()
+        return Simulation(self.ready_queue(arrival, remaining, priority), remaining,
+                          SortedArrivals(order, arrival), self.merge_slices, closed=True)
+
+    def _segments(self, table):
+        """Generate the segments of the schedule of a ProcessTable.
+
+        Args:
+            table (ProcessTable): Processes to be scheduled.
+
+        Yields:
+            tuple: (row, start time, duration) of each segment, where row is
+                the table row of the running process.
+        """
+        segments = self.simulation(table).run()
+        return merge_segments(segments) if self.merge_slices else segments
+
+    def segments(self, processes):
+        """Lazily generate the schedule one segment at a time.
+
+        Only the per-process scheduling state is kept in memory, never the
+        segments already produced, so arbitrarily long schedules can be
+        consumed in bounded memory.
+
+        Args:
+            processes (list or ProcessTable): Processes to be scheduled.
+
+        Yields:
+            tuple: (process ID, start time, duration) of each segment.
+        """
+        table = as_process_table(processes)
+        names = table.names
+        pid_index = table.pid_index.tolist()
+        for row, start, duration in self._segments(table):
+            yield names[pid_index[row]], start, duration
+
+    def schedule(self, processes):
+        """Schedule processes.
+
+        Args:
+            processes (list or ProcessTable): Processes to be scheduled.
+
+        Returns:
+            Schedule: The segments in dispatch order.
+        """
+        table = as_process_table(processes)
+        rows = array("q")
+        start_times = time_buffer(table)
+        durations = time_buffer(table)
+        add_row, add_start, add_duration = rows.append, start_times.append, durations.append
+        for row, start, duration in self._segments(table):
+            add_row(row)
+            add_start(start)
+            add_duration(duration)
+        return Schedule.from_rows(table, rows, start_times, durations)
+
+    def online(self):
+        """Create an empty incremental state for online scheduling.
+
+        Returns:
+            OnlineState: State fed through submit(), advance() and drain().
+        """
+        return OnlineState(self.ready_queue, self.needs_priority, self.merge_slices)
+
 class FCFS(SchedulingAlgorithm):
     """First-Come, First-Served scheduling algorithm."""
     
     def __init__(self):
         self.name = "First-Come, First-Served"
-        
+
+    def ready_queue(self, arrival, remaining, priority):
+        """Processes run to completion in arrival order."""
+        return FIFOQueue()
+
     def schedule(self, processes):
         """Schedule processes using First-Come, First-Served algorithm.
 
+        Equivalent to running the FIFO policy through the kernel, but computed
+        with vectorized passes over the columns.
+
         Args:
-            processes (list): List of Process objects to be scheduled.
+            processes (list or ProcessTable): Processes to be scheduled.
 
         Returns:
-            tuple: A tuple containing lists of process names, start times, and durations.
+            Schedule: The segments, one per process.
         """
-        # Sort processes by arrival time
-        processes = sorted(processes, key=lambda x: x.arrival_time)
-        names = []
-        start_times = []
-        duration = []
+        table = as_process_table(processes)
+        order, start_times, _, _, _ = self.schedule_arrays(table.arrival_times, table.burst_times)
+        return Schedule.from_rows(table, order, start_times, table.burst_times[order])
 
-        # Initialize lists with the first process
-        names.append(processes[0].pid)
-        start_times.append(processes[0].arrival_time)
-        duration.append(processes[0].burst_time)
+    @staticmethod
+    def schedule_arrays(arrival_times, burst_times):
+        """Schedule raw arrival and burst arrays using vectorized passes.
 
-        for p in range(1, len(processes)):
-            names.append(processes[p].pid)
-            start_times.append(max(start_times[p - 1] + duration[p - 1], processes[p].arrival_time))
-            duration.append(processes[p].burst_time)
+        start[i] = max(arrival[i], start[i-1] + burst[i-1]) is a running max, so
+        with C the cumulative burst the finish times are
+        C[i] + max(arrival[j] - C[j-1] for j <= i), i.e. one cumsum and one
+        cumulative maximum over the arrival-sorted arrays.
 
-        return names, start_times, duration
+        Args:
+            arrival_times (array-like): Arrival time of each process.
+            burst_times (array-like): Burst time of each process.
+
+        Returns:
+            tuple: NumPy arrays (order, start, finish, waiting, turnaround), where
+                order holds the input index of each process in dispatch order and
+                the other arrays are aligned with it.
+        """
+        arrival_times = np.asarray(arrival_times)
+        burst_times = np.asarray(burst_times)
+        if np.all(arrival_times[1:] >= arrival_times[:-1]):
+            # Traces are usually recorded in arrival order already
+            order = np.arange(len(arrival_times))
+        else:
+            order = np.argsort(arrival_times, kind="stable")
+        arrival = arrival_times[order]
+        burst = burst_times[order]
+        cumulative = np.cumsum(burst)
+        finish = cumulative + np.maximum.accumulate(arrival - (cumulative - burst))
+        start = finish - burst
+        return order, start, finish, start - arrival, finish - arrival
 
 class SJF(SchedulingAlgorithm):
     """Shortest Job First scheduling algorithm."""
     
     def __init__(self):
         self.name = "Shortest Job First"
-        
-    def schedule(self, processes):
-        """Schedule processes using Shortest Job First algorithm.
 
-        Args:
-            processes (list): List of Process objects to be scheduled.
+    def ready_queue(self, arrival, remaining, priority):
+        """The shortest ready job runs to completion, ties going to the earliest arrival."""
+        return KeyedQueue(lambda row: (remaining[row], arrival[row]))
 
-        Returns:
-            tuple: A tuple containing lists of process names, start times, and durations.
-        """
-        n = len(processes)
-        processes.sort(key=lambda process: (process.arrival_time, process.burst_time))
-        names = []
-        start_times = []
-        duration = []
-
-        # Initialize lists with the first process
-        names.append(processes[0].pid)
-        start_times.append(processes[0].arrival_time)
-        duration.append(processes[0].burst_time)
-        time_to_next = processes[0].arrival_time + processes[0].burst_time
-        processes.remove(processes[0])
-
-        while len(names) < n:
-            candidates = []
-            for p in range(len(processes)):
-                if processes[p].arrival_time <= time_to_next:
-                    candidates.append(processes[p])
-
-            if len(candidates) == 0:
-                time_to_next = processes[0].arrival_time
-                continue
-
-            candidates.sort(key=lambda process: process.burst_time)
-            names.append(candidates[0].pid)
-            start_times.append(time_to_next)
-            duration.append(candidates[0].burst_time)
-            time_to_next += candidates[0].burst_time
-            processes.remove(candidates[0])
-
-        return names, start_times, duration
+class SRTF(SchedulingAlgorithm):
+    """Shortest Remaining Time First: preemptive Shortest Job First.
+
+    The ready processes sit in a heap keyed on their remaining time, and the
+    running process is only reconsidered when a new process arrives, so the
+    schedule costs O(n log n) however large the burst times are. A process
+    that keeps the CPU across an arrival continues in the same segment, so
+    segments only end at real preemptions and completions.
+    """
+
+    merge_slices = True
+
+    def __init__(self):
+        self.name = "Shortest Remaining Time First"
+
+    def ready_queue(self, arrival, remaining, priority):
+        """The ready process with the least remaining time runs until the next arrival."""
+        return KeyedQueue(lambda row: (remaining[row], arrival[row]), preemptive=True)
 
 class Priority(SchedulingAlgorithm):
     """Priority scheduling algorithm."""
+
+    needs_priority = True
     
     def __init__(self):
         self.name = "Priority Scheduling"
-        
-    def schedule(self, processes):
-        """Schedule processes using Priority Scheduling algorithm.
 
-        Args:
-            processes (list): List of Process objects to be scheduled.
-
-        Returns:
-            tuple: A tuple containing lists of process names, start times, and durations.
-        """
-        n = len(processes)
-        processes.sort(key=lambda process: (process.arrival_time, -process.priority))
-        names = []
-        start_times = []
-        duration = []
-
-        # Initialize lists with the first process
-        names.append(processes[0].pid)
-        start_times.append(processes[0].arrival_time)
-        duration.append(processes[0].burst_time)
-        time_to_next = processes[0].arrival_time + processes[0].burst_time
-        processes.remove(processes[0])
-
-        while len(names) < n:
-            candidates = []
-            for p in range(len(processes)):
-                if processes[p].arrival_time <= time_to_next:
-                    candidates.append(processes[p])
-            
-            if len(candidates) == 0:
-                time_to_next = processes[0].arrival_time
-                continue
-            
-            candidates.sort(key=lambda process: process.priority)
-            names.append(candidates[0].pid)
-            start_times.append(time_to_next)
-            duration.append(candidates[0].burst_time)
-            time_to_next += candidates[0].burst_time
-            processes.remove(candidates[0])
-
-        return names, start_times, duration
+    def ready_queue(self, arrival, remaining, priority):
+        """The ready job with the lowest priority value runs to completion, ties going to the earliest arrival."""
+        return KeyedQueue(lambda row: (priority[row], arrival[row]))
 
 class RR(SchedulingAlgorithm):
-    """Round Robin Scheduling algorithm."""
+    """Round Robin Scheduling algorithm.
+
+    When ``merge_slices`` is set, back-to-back slices of the same process are
+    merged into one segment, and a process that is alone on the CPU runs in a
+    single step until the next arrival instead of one quantum at a time.
+    """
     
-    def __init__(self, time_quantum):
+    def __init__(self, time_quantum, merge_slices=False):
         self.quantum = time_quantum
+        self.merge_slices = merge_slices
         self.name = "Round Robin Scheduling"
-    
-    def schedule(self, processes):
-        """Schedule processes using Round Robin Scheduling algorithm.
-
-        Args:
-            processes (list): List of Process objects to be scheduled.
 
-        Returns:
-            tuple: A tuple containing lists of process names, start times, and durations.
-        """
-        processes.sort(key=lambda process: process.arrival_time)
-        n = len(processes)
-        queue = []
-        names = []
-        start_times = []
-        duration = []
-
-        for i in range(n):
-            processes[i].remaining_time = processes[i].burst_time
-
-        time_to_next = processes[0].arrival_time
-        queue.append(processes[0])
-        next_idx = 1
-
-        while len(queue) > 0:
-            in_queue = queue.pop(0)
-            names.append(in_queue.pid)
-            start_times.append(time_to_next)
-
-            if in_queue.remaining_time > self.quantum:
-                duration.append(self.quantum)
-                in_queue.remaining_time -= self.quantum
-                time_to_next += self.quantum
-            else:
-                duration.append(in_queue.remaining_time)
-                time_to_next += in_queue.remaining_time
-                in_queue.remaining_time = 0
-
-            to_enqueue = []
-            while next_idx < n and processes[next_idx].arrival_time <= time_to_next:
-                to_enqueue.append(processes[next_idx])
-                next_idx += 1
-            queue.extend(to_enqueue)
-
-            if in_queue.remaining_time > 0:
-                queue.append(in_queue)
-            else:
-                if len(queue) == 0:
-                    if next_idx < n:
-                        queue.append(processes[next_idx])
-                        time_to_next = processes[next_idx].arrival_time
-                        next_idx += 1
-
-        return names, start_times, duration
+    def ready_queue(self, arrival, remaining, priority):
+        """Processes take turns of one quantum in a single FIFO queue."""
+        return FIFOQueue(self.quantum)
 
 class PriorityRR(SchedulingAlgorithm):
-    """Priority with Round Robin Scheduling algorithm."""
+    """Priority with Round Robin Scheduling algorithm.
+
+    Every distinct priority value gets its own round robin queue, and the
+    lowest non-empty level always runs next. The non-empty levels are kept in
+    a heap so that finding the next level costs O(log L).
+    """
+
+    needs_priority = True
     
     def __init__(self, time_quantum):
         self.quantum = time_quantum
         self.name = "Priority with Round Robin Scheduling"
 
-    def check_all_queues_empty(self, queues):
-        for queue in queues:
-            if queue:
-                return False
-        return True
+    def ready_queue(self, arrival, remaining, priority):
+        """Processes take turns of one quantum within their priority level."""
+        return LevelQueue(priority.__getitem__, self.quantum)
 
-    def schedule(self, processes):
-        """Schedule processes using Priority with Round Robin Scheduling algorithm.
+class MLFQ(SchedulingAlgorithm):
+    """Multilevel Feedback Queue scheduling algorithm.
 
-        Args:
-            processes (list): List of Process objects to be scheduled.
+    Processes start in the highest level and move one level down each time
+    they use up their slice; the slice doubles from one level to the next.
+    Every ``boost_interval`` time units all waiting processes move back to
+    the highest level so long jobs do not starve. The highest non-empty
+    level is found with a bitmask in O(1), and a boost costs O(levels).
+    """
 
-        Returns:
-            tuple: A tuple containing lists of process names, start times, and durations.
+    def __init__(self, time_quantum, levels=MLFQ_LEVELS, boost_interval=None):
+        """Initialize the MLFQ.
+
+        Args:
+            time_quantum (int): Slice of the highest level.
+            levels (int, optional): Number of levels.
+            boost_interval (int, optional): Time between priority boosts,
+                MLFQ_BOOST_QUANTA base quanta by default.
         """
-        names = []
-        start_times = []
-        duration = []
-        processes.sort(key=lambda process: (process.arrival_time, process.priority))
-        max_priority = max([process.priority for process in processes])
-        queues = [[] for _ in range(max_priority + 1)]
-        rrqueues = [[] for _ in range(max_priority + 1)]
-        for process in processes:
-            queues[process.priority].append(process)
-        time_to_next = processes[0].arrival_time
-        current_queue = processes[0].priority
-        rrqueues[current_queue].append(queues[current_queue].pop(0))
-        while not self.check_all_queues_empty(rrqueues):
-            to_execute = rrqueues[current_queue].pop(0)
-            names.append(to_execute.pid)
-            start_times.append(time_to_next)
-            if to_execute.remaining_time > self.quantum:
-                duration.append(self.quantum)
-                to_execute.remaining_time -= self.quantum
-                time_to_next += self.quantum
-            else:
-                duration.append(to_execute.remaining_time)
-                time_to_next += to_execute.remaining_time
-                to_execute.remaining_time = 0
-            for i in range(len(queues)):
-                if queues[i]:
-                    for process in queues[i]:
-                        if process.arrival_time <= time_to_next:
-                            rrqueues[i].append(queues[i].pop(0))
-            if to_execute.remaining_time > 0:
-                rrqueues[current_queue].append(to_execute)
-            more_priorities = False
-            for i in range(1, current_queue):
-                if rrqueues[i]:
-                    more_priorities = True
-                    current_queue = i
-                    break
-            if more_priorities or rrqueues[current_queue]:
-                continue
-            else:
-                less_priorities = False
-                for i in range(current_queue + 1, max_priority + 1):
-                    if rrqueues[i]:
-                        less_priorities = True
-                        current_queue = i
-                        break
-            if not more_priorities and not less_priorities:
-                found_next = False
-                time_to_next = 1000000
-                for i in range(1, max_priority + 1):
-                    if queues[i] and queues[i][0].arrival_time < time_to_next:
-                        time_to_next = queues[i][0].arrival_time
-                        found_next = True
-                        current_queue = i
-                if not found_next:
-                    nxt = 1
-                    for i in range(1, max_priority + 1):
-                        if queues[i]:
-                            if queues[i][0].arrival_time < time_to_next:
-                                nxt = i
-                                found_next = True
-                                time_to_next = queues[i][0].arrival_time
-                    if not found_next:
-                        break
-                    else:
-                        rrqueues[nxt].append(queues[nxt].pop(0))
-                else:
-                    rrqueues[current_queue].append(queues[current_queue].pop(0))
-
-        return names, start_times, duration
+        if levels < 1:
+            raise ValueError("MLFQ needs at least one level")
+        self.quantum = time_quantum
+        self.quanta = [time_quantum << level for level in range(levels)]
+        self.boost_interval = boost_interval or MLFQ_BOOST_QUANTA * time_quantum
+        if self.boost_interval < 1:
+            raise ValueError("MLFQ boost interval must be a positive integer")
+        self.name = "Multilevel Feedback Queue"
+
+    def ready_queue(self, arrival, remaining, priority):
+        """Processes take turns within the highest non-empty level and are demoted after a full slice."""
+        return FeedbackQueue(self.quanta, self.boost_interval)
+
+ALGORITHMS = {
+    "FCFS": FCFS,
+    "SJF": SJF,
+    "SRTF": SRTF,
+    "Priority": Priority,
+    "RR": RR,
+    "PriorityRR": PriorityRR,
+    "MLFQ": MLFQ,
+}
+
+QUANTUM_ALGORITHMS = {"RR", "PriorityRR", "MLFQ"}
+
+
+def make_algorithm(name, quantum=None):
+    """Create a scheduling algorithm from its short name.
+
+    Args:
+        name (str): One of the keys of ALGORITHMS, e.g. "FCFS" or "RR".
+        quantum (int, optional): Time quantum, required by the round robin algorithms.
+
+    Returns:
+        SchedulingAlgorithm: A new instance of the algorithm.
+    """
+    if name not in ALGORITHMS:
+        raise ValueError(f"Unknown scheduling algorithm: {name}")
+    if name in QUANTUM_ALGORITHMS:
+        if quantum is None or quantum == "":
+            raise ValueError(f"{name} requires a time quantum")
+        if int(quantum) < 1:
+            raise ValueError("Time quantum must be a positive integer")
+        return ALGORITHMS[name](int(quantum))
+    return ALGORITHMS[name]()
@@ -0,0 +1,416 @@
+"""Discrete-event simulation kernel shared by every scheduling algorithm.
+
+A Simulation owns the clock, the arrival events and the process on the CPU;
+which ready process runs next, and for how long, is delegated to a ready-queue
+policy. Algorithms differ only in their policy, so batch scheduling, online
+scheduling and trace replay all run through the same event loop.
+"""
+from collections import deque
+import heapq
+
+INF = float("inf")
+
+
+class ReadyQueue:
+    """Interface of the ready-queue policies.
+
+    The kernel pushes every arrived process, pops the process to dispatch,
+    asks for the length of its slice and requeues it if it did not finish.
+    The kernel counts the queued processes itself and only pops when one is
+    queued.
+    """
+
+    # Fixed slice length, or None if processes run for as long as slice() says
+    quantum = None
+
+    # Whether an arrival interrupts the running slice so the queue is reconsidered
+    preemptive = False
+
+    # Time at which timer() is next due, e.g. for a periodic priority boost
+    next_timer = INF
+
+    def push(self, row):
+        """Add a process that just arrived."""
+        raise NotImplementedError
+
+    def requeue(self, row):
+        """Return a process whose slice ended before it finished."""
+        self.push(row)
+
+    def pop(self):
+        """Remove and return the process to dispatch next."""
+        raise NotImplementedError
+
+    def slice(self, row, remaining):
+        """Return how long ``row`` runs once dispatched, given its remaining time."""
+        return remaining if self.quantum is None else min(self.quantum, remaining)
+
+    def timer(self, time):
+        """Handle the timer, called at the first decision at or after ``next_timer``."""
+
+
+class FIFOQueue(ReadyQueue):
+    """First-in, first-out queue: FCFS, or Round Robin with a quantum."""
+
+    def __init__(self, quantum=None):
+        """Initialize the FIFOQueue.
+
+        Args:
+            quantum (int, optional): Time slice, or None to run processes to completion.
+        """
+        self.quantum = quantum
+        self.queue = deque()
+        self.push = self.requeue = self.queue.append
+        self.pop = self.queue.popleft
+
+
+class KeyedQueue(ReadyQueue):
+    """Min-heap on a key computed when a process enters the queue.
+
+    Ties between equal keys go to the lower row.
+    """
+
+    def __init__(self, key, quantum=None, preemptive=False):
+        """Initialize the KeyedQueue.
+
+        Args:
+            key (callable): Maps a row to its ordering key, a tuple such as
+                (burst time, arrival time) for SJF.
+            quantum (int, optional): Time slice, or None to run processes to completion.
+            preemptive (bool, optional): Reconsider the running process at every arrival.
+        """
+        self.key = key
+        self.quantum = quantum
+        self.preemptive = preemptive
+        self.heap = []
+
+    def push(self, row):
+        # Flat (key..., row) entries compare faster than nested tuples
+        heapq.heappush(self.heap, self.key(row) + (row,))
+
+    def pop(self):
+        return heapq.heappop(self.heap)[-1]
+
+
+class LevelQueue(ReadyQueue):
+    """One FIFO queue per priority level; the lowest non-empty level runs next.
+
+    The non-empty levels are kept in a heap, so finding the next level costs
+    O(log L) for L distinct levels; levels that drain are dropped lazily.
+    """
+
+    def __init__(self, level, quantum=None):
+        """Initialize the LevelQueue.
+
+        Args:
+            level (callable): Maps a row to its level, e.g. its priority.
+            quantum (int, optional): Time slice, or None to run processes to completion.
+        """
+        self.level = level
+        self.quantum = quantum
+        self.queues = {}
+        self.levels = []
+
+    def push(self, row):
+        level = self.level(row)
+        queue = self.queues.get(level)
+        if queue is None:
+            queue = self.queues[level] = deque()
+            heapq.heappush(self.levels, level)
+        queue.append(row)
+
+    def pop(self):
+        levels, queues = self.levels, self.queues
+        while not queues[levels[0]]:
+            del queues[heapq.heappop(levels)]
+        return queues[levels[0]].popleft()
+
+
+class FeedbackQueue(ReadyQueue):
+    """Multilevel feedback queue with demotion and a periodic priority boost.
+
+    New processes enter level 0. A process that uses up its slice moves one
+    level down, where slices are longer, and every ``boost_interval`` time
+    units all queued processes move back to level 0.
+
+    Each level is a FIFO of chunks (deques of rows) and a bitmask holds the
+    non-empty levels, so the highest non-empty level is the lowest set bit
+    and is found in O(1). A boost appends the chunks of the lower levels to
+    level 0 in order, which costs O(levels) however many processes move.
+    """
+
+    def __init__(self, quanta, boost_interval=None):
+        """Initialize the FeedbackQueue.
+
+        Args:
+            quanta (list): Time slice of each level, from the highest level down.
+            boost_interval (int, optional): Time between priority boosts, or None for no boost.
+        """
+        self.quanta = list(quanta)
+        self.boost_interval = boost_interval
+        self.next_timer = INF if boost_interval is None else boost_interval
+        self.levels = [deque() for _ in self.quanta]
+        self.mask = 0
+        # Level of the process popped last, i.e. the one on the CPU
+        self.level = 0
+        self.boosts = 0
+
+    def _append(self, level, row):
+        chunks = self.levels[level]
+        if chunks:
+            chunks[-1].append(row)
+        else:
+            chunks.append(deque((row,)))
+            self.mask |= 1 << level
+
+    def push(self, row):
+        self._append(0, row)
+
+    def requeue(self, row):
+        # The process used its whole slice: demote it
+        self._append(min(self.level + 1, len(self.quanta) - 1), row)
+
+    def pop(self):
+        level = (self.mask & -self.mask).bit_length() - 1
+        chunks = self.levels[level]
+        chunk = chunks[0]
+        row = chunk.popleft()
+        if not chunk:
+            chunks.popleft()
+            if not chunks:
+                self.mask &= ~(1 << level)
+        self.level = level
+        return row
+
+    def slice(self, row, remaining):
+        return min(self.quanta[self.level], remaining)
+
+    def timer(self, time):
+        top = self.levels[0]
+        for level in range(1, len(self.levels)):
+            if self.levels[level]:
+                top.extend(self.levels[level])
+                self.levels[level] = deque()
+        self.mask = 1 if top else 0
+        self.boosts += 1
+        self.next_timer = (time // self.boost_interval + 1) * self.boost_interval
+
+
+class ArrivalHeap:
+    """Arrival events of processes submitted in any order."""
+
+    def __init__(self):
+        """Initialize the ArrivalHeap."""
+        self.heap = []
+
+    def push(self, arrival_time, row):
+        """Schedule the arrival of ``row``."""
+        heapq.heappush(self.heap, (arrival_time, row))
+
+    def next_time(self):
+        """Return the time of the next arrival, or INF if there is none."""
+        return self.heap[0][0] if self.heap else INF
+
+    def pop_until(self, time):
+        """Remove and return the rows arriving at or before ``time``, in arrival order."""
+        heap = self.heap
+        rows = []
+        while heap and heap[0][0] <= time:
+            rows.append(heapq.heappop(heap)[1])
+        return rows
+
+    def __len__(self):
+        return len(self.heap)
+
+
+class SortedArrivals:
+    """Arrival events of a whole workload, read through a cursor over the arrival-sorted rows."""
+
+    def __init__(self, order, arrival):
+        """Initialize the SortedArrivals.
+
+        Args:
+            order (list): Rows sorted by arrival time, ties in row order.
+            arrival (list): Arrival time of each row.
+        """
+        self.order = order
+        self.arrival = arrival
+        self.cursor = 0
+
+    def next_time(self):
+        """Return the time of the next arrival, or INF if there is none."""
+        if self.cursor == len(self.order):
+            return INF
+        return self.arrival[self.order[self.cursor]]
+
+    def pop_until(self, time):
+        """Remove and return the rows arriving at or before ``time``, in arrival order."""
+        order, arrival = self.order, self.arrival
+        start = end = self.cursor
+        while end < len(order) and arrival[order[end]] <= time:
+            end += 1
+        self.cursor = end
+        return order[start:end]
+
+    def __len__(self):
+        return len(self.order) - self.cursor
+
+
+class Simulation:
+    """Event loop of a single CPU.
+
+    The events are the arrivals, kept in an arrival queue, and the end of the
+    running slice, which is a completion, a quantum expiry or, for preemptive
+    policies, the next arrival. When the
+    ready queue is empty the clock jumps straight to the next arrival, so
+    idle periods cost nothing, and every event costs O(log n) at most.
+    Processes that arrive while a slice runs enter the ready queue before
+    the preempted process is requeued.
+    """
+
+    def __init__(self, policy, remaining, arrivals, merge_slices=False, closed=False):
+        """Initialize the Simulation.
+
+        Args:
+            policy (ReadyQueue): Chooses the next process and its slice.
+            remaining (list or dict): Remaining time of each row, updated in place.
+            arrivals (ArrivalHeap or SortedArrivals): Arrival events.
+            merge_slices (bool, optional): Run a process that is alone on the CPU
+                until the next arrival in one step (fixed-quantum policies only).
+            closed (bool, optional): Whether every arrival is already known,
+                which merge_slices requires.
+        """
+        self.policy = policy
+        self.remaining = remaining
+        self.arrivals = arrivals
+        self.stretch = merge_slices and closed
+        # Time of the next decision, and the (row, start, end) of the slice on the CPU
+        self.time = None
+        self.running = None
+        # Number of processes in the ready queue
+        self.ready = 0
+        # Called with the row of each process that finishes
+        self.on_finish = None
+        # Instrumentation counters
+        self.dispatches = 0
+        self.requeues = 0
+        self.idle_jumps = 0
+
+    @property
+    def stats(self):
+        """dict: Number of dispatches, requeues and idle jumps so far."""
+        return {"dispatches": self.dispatches, "requeues": self.requeues, "idle_jumps": self.idle_jumps}
+
+    def run(self, until_time=INF):
+        """Take every scheduling decision due strictly before ``until_time``.
+
+        Args:
+            until_time (int, optional): Time to stop at; INF runs until every
+                known process has finished.
+
+        Yields:
+            tuple: (row, start time, duration) of each dispatched slice. Slices
+                of preemptive policies are yielded once their end is final.
+        """
+        policy, arrivals, remaining = self.policy, self.arrivals, self.remaining
+        push, requeue, pop, slice_ = policy.push, policy.requeue, policy.pop, policy.slice
+        quantum = policy.quantum
+        # Policies that keep the default slice() get it inlined
+        fixed_slices = type(policy).slice is ReadyQueue.slice
+        stretch = self.stretch and quantum is not None
+        preemptive = policy.preemptive
+        next_timer = policy.next_timer
+        on_finish = self.on_finish
+        time, running, ready = self.time, self.running, self.ready
+        dispatches = requeues = idle_jumps = 0
+        next_arrival = arrivals.next_time()
+        try:
+            while True:
+                if running is not None:
+                    row, start, end = running
+                    if preemptive and next_arrival < end:
+                        # A process submitted since the dispatch arrives during the slice
+                        remaining[row] += end - next_arrival
+                        end = next_arrival
+                        running = (row, start, end)
+                    # The end of a slice is only final once every arrival up to it is known
+                    if end >= until_time:
+                        return
+                    running = None
+                    time = end
+                    if preemptive:
+                        yield row, start, end - start
+                    if next_arrival <= time:
+                        for arrived in arrivals.pop_until(time):
+                            push(arrived)
+                            ready += 1
+                        next_arrival = arrivals.next_time()
+                    if remaining[row] > 0:
+                        requeue(row)
+                        ready += 1
+                        requeues += 1
+                    elif on_finish is not None:
+                        on_finish(row)
+                if not ready:
+                    if next_arrival >= until_time:
+                        return
+                    if time is None or next_arrival > time:
+                        # CPU is idle: jump straight to the next arrival
+                        time = next_arrival
+                        idle_jumps += 1
+                if next_arrival <= time:
+                    for arrived in arrivals.pop_until(time):
+                        push(arrived)
+                        ready += 1
+                    next_arrival = arrivals.next_time()
+                if time >= next_timer:
+                    policy.timer(time)
+                    next_timer = policy.next_timer
+                row = pop()
+                ready -= 1
+                if not fixed_slices:
+                    run = slice_(row, remaining[row])
+                elif quantum is None or remaining[row] <= quantum:
+                    run = remaining[row]
+                else:
+                    run = quantum
+                if stretch and not ready:
+                    # Alone on the CPU: every quantum that starts before the next
+                    # arrival runs uninterrupted, so take them in one step
+                    if next_arrival == INF:
+                        run = remaining[row]
+                    else:
+                        run = min(max(1, -(-(next_arrival - time) // quantum)) * quantum, remaining[row])
+                if preemptive and next_arrival - time < run:
+                    run = next_arrival - time
+                remaining[row] -= run
+                running = (row, time, time + run)
+                dispatches += 1
+                if not preemptive:
+                    yield row, time, run
+        finally:
+            self.time, self.running, self.ready = time, running, ready
+            self.dispatches += dispatches
+            self.requeues += requeues
+            self.idle_jumps += idle_jumps
+
+
+def merge_segments(segments):
+    """Merge back-to-back segments of the same row into one.
+
+    Args:
+        segments: Iterable of (row, start time, duration).
+
+    Yields:
+        tuple: The merged (row, start time, duration) segments.
+    """
+    pending = None
+    for row, start, duration in segments:
+        if pending is not None and pending[0] == row:
+            pending[2] += duration
+            continue
+        if pending is not None:
+            yield tuple(pending)
+        pending = [row, start, duration]
+    if pending is not None:
+        yield tuple(pending)
@@ -0,0 +1,219 @@
+"""Binary workload files that load through mmap without parsing.
+
+Layout (little-endian, every section starts on an 8-byte boundary)::
+
+    header        HEADER_SIZE bytes: magic, version, flags, rows, names, name bytes
+    pid_index     int32[rows]   index of each row's pid in the name table
+    arrival_times int64[rows]
+    burst_times   int64[rows]
+    priorities    int64[rows]   only if the FLAG_PRIORITIES bit is set; INT64_MIN where missing
+    name offsets  uint32 or uint64 (FLAG_WIDE_OFFSETS) [names + 1]
+    name bytes    UTF-8 pids, back to back
+
+Usage:
+    python WorkloadFile.py workload.csv workload.pswl
+"""
+import mmap
+import struct
+import sys
+
+import numpy as np
+
+from ProcessTable import ProcessTable
+
+MAGIC = b"PSWKLD\r\n"
+
+VERSION = 1
+
+# magic, version, flags, rows, names, name bytes
+HEADER = struct.Struct("<8sIIQQQ")
+HEADER_SIZE = 64
+
+FLAG_PRIORITIES = 1
+FLAG_WIDE_OFFSETS = 2
+
+# File extension used by the converter and the upload forms
+EXTENSION = ".pswl"
+
+
+def _align(offset):
+    """Round ``offset`` up to the next multiple of 8."""
+    return (offset + 7) & ~7
+
+
+class NameTable:
+    """Name table of a workload file, decoded on demand.
+
+    The pids stay in one UTF-8 buffer with an offsets array, so opening a file
+    with millions of pids does not create one string per process.
+    """
+
+    def __init__(self, offsets, data):
+        """Initialize the NameTable.
+
+        Args:
+            offsets (numpy.ndarray): Start of each name in ``data``, plus the end of the last one.
+            data (numpy.ndarray): uint8 array of the UTF-8 encoded names.
+        """
+        self.offsets = offsets
+        self.data = data
+
+    def __len__(self):
+        """Return the number of names."""
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        """Return the pid at index ``i``."""
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("process index out of range")
+        return self.data[self.offsets[i]:self.offsets[i + 1]].tobytes().decode("utf-8")
+
+    def __iter__(self):
+        """Iterate over the pids."""
+        data = self.data.tobytes()
+        offsets = self.offsets.tolist()
+        return (data[start:end].decode("utf-8") for start, end in zip(offsets, offsets[1:]))
+
+
+def is_workload_file(prefix):
+    """Return True if ``prefix``, the first bytes of a file, starts a binary workload."""
+    return bytes(prefix[:len(MAGIC)]) == MAGIC
+
+
+def write_workload(processes, path):
+    """Write a workload in the binary format.
+
+    Args:
+        processes (ProcessTable): The workload.
+        path (str): Destination file.
+    """
+    rows = len(processes)
+    encoded = [str(name).encode("utf-8") for name in processes.names]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.uint64)
+    np.cumsum(np.fromiter(map(len, encoded), dtype=np.uint64, count=len(encoded)), out=offsets[1:])
+    name_bytes = int(offsets[-1])
+    flags = 0
+    if processes.priorities is not None:
+        flags |= FLAG_PRIORITIES
+    if name_bytes >= 2 ** 32:
+        flags |= FLAG_WIDE_OFFSETS
+    else:
+        offsets = offsets.astype(np.uint32)
+
+    columns = [np.ascontiguousarray(processes.pid_index, dtype="<i4")]
+    for column in (processes.arrival_times, processes.burst_times, processes.priorities):
+        if column is None:
+            continue
+        if column.dtype.kind == "f":
+            raise ValueError("Binary workloads only hold integer times and priorities")
+        columns.append(np.ascontiguousarray(column, dtype="<i8"))
+    columns.append(offsets.astype(offsets.dtype.newbyteorder("<"), copy=False))
+
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, flags, rows, len(encoded), name_bytes).ljust(HEADER_SIZE, b"\0"))
+        position = HEADER_SIZE
+        for column in columns:
+            f.write(b"\0" * (_align(position) - position))
+            position = _align(position)
+            f.write(memoryview(column).cast("B"))
+            position += column.nbytes
+        f.write(b"\0" * (_align(position) - position))
+        for name in encoded:
+            f.write(name)
+
+
+def load_workload(buffer):
+    """Wrap a binary workload held in ``buffer`` in a ProcessTable without copying.
+
+    Args:
+        buffer: Bytes-like object (bytes, bytearray, mmap) with the file contents.
+
+    Returns:
+        ProcessTable: The workload; its columns are views of ``buffer``.
+
+    Raises:
+        ValueError: If the buffer is not a valid binary workload.
+    """
+    if len(buffer) < HEADER_SIZE:
+        raise ValueError("Binary workload is truncated")
+    magic, version, flags, rows, name_count, name_bytes = HEADER.unpack_from(buffer)
+    if magic != MAGIC:
+        raise ValueError("Not a binary workload file")
+    if version != VERSION:
+        raise ValueError(f"Unsupported binary workload version {version}")
+    if flags & ~(FLAG_PRIORITIES | FLAG_WIDE_OFFSETS):
+        raise ValueError(f"Unknown binary workload flags {flags:#x}")
+
+    position = HEADER_SIZE
+
+    def section(dtype, count):
+        nonlocal position
+        position = _align(position)
+        dtype = np.dtype(dtype)
+        end = position + dtype.itemsize * count
+        if end > len(buffer):
+            raise ValueError("Binary workload is truncated")
+        column = np.frombuffer(buffer, dtype=dtype, count=count, offset=position)
+        position = end
+        return column
+
+    pid_index = section("<i4", rows)
+    arrival_times = section("<i8", rows)
+    burst_times = section("<i8", rows)
+    priorities = section("<i8", rows) if flags & FLAG_PRIORITIES else None
+    offsets = section("<u8" if flags & FLAG_WIDE_OFFSETS else "<u4", name_count + 1)
+    names = NameTable(offsets, section(np.uint8, name_bytes))
+
+    # Every index into the name table and every name must lie within the file
+    if rows and (pid_index.min() < 0 or pid_index.max() >= name_count):
+        raise ValueError("Binary workload refers to a process name that does not exist")
+    if offsets[0] != 0 or offsets[-1] != name_bytes or np.any(offsets[1:] < offsets[:-1]):
+        raise ValueError("Binary workload has an invalid name table")
+    return ProcessTable.from_columns(names, pid_index, arrival_times, burst_times, priorities)
+
+
+def open_workload(path_or_file):
+    """Memory-map a binary workload file into a ProcessTable.
+
+    The columns are read-only views of the mapping. Opening a file only scans
+    the pid indexes and the name table to validate them; the other pages are
+    read as the scheduler touches them.
+
+    Args:
+        path_or_file: Path of the file, or an open binary file object.
+
+    Returns:
+        ProcessTable: The workload.
+    """
+    if isinstance(path_or_file, (str, bytes)) or hasattr(path_or_file, "__fspath__"):
+        with open(path_or_file, "rb") as f:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    else:
+        mapping = mmap.mmap(path_or_file.fileno(), 0, access=mmap.ACCESS_READ)
+    return load_workload(mapping)
+
+
+def convert_csv(csv_path, workload_path):
+    """Convert a CSV workload into the binary format.
+
+    Args:
+        csv_path (str): CSV file with ``process_id,arrival_time,burst_time[,priority]`` lines.
+        workload_path (str): Destination binary file.
+
+    Returns:
+        int: Number of processes written.
+    """
+    from Ingest import read_workload
+
+    with open(csv_path, "rb") as f:
+        processes = read_workload(f)
+    write_workload(processes, workload_path)
+    return len(processes)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        sys.exit(f"Usage: python {sys.argv[0]} workload.csv workload{EXTENSION}")
+    print(f"Wrote {convert_csv(sys.argv[1], sys.argv[2])} processes to {sys.argv[2]}")
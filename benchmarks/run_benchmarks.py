@@ -0,0 +1,267 @@
+"""Benchmark the scheduling algorithms, metrics and rendering on generated workloads.
+
+Workloads are generated with the ranges of APP_CONFIG.txt (or the overrides
+given on the command line) for every combination of size and arrival pattern.
+Each algorithm is timed on each workload, followed by the metrics and
+rendering stages, and the throughput and peak traced memory of every stage are
+recorded. The results are compared with a stored baseline and the script exits
+with status 1 if any stage got slower or bigger than the tolerance allows, or
+with status 2 if the baseline was recorded with different parameters.
+
+Usage:
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --sizes 100,1000,10000,100000,1000000,10000000
+    python benchmarks/run_benchmarks.py --save-baseline benchmarks/baseline.json
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Charts import build_bar_chart, build_utilization_chart  # noqa: E402
+from Config import APP_CONFIG_PATH, RANGE_KEYS, read_app_config  # noqa: E402
+from Gantt import build_gantt_figure  # noqa: E402
+from Generator import ARRIVAL_PATTERNS, generate_workload  # noqa: E402
+from Metrics import schedule_metrics  # noqa: E402
+from SchedulingAlgorithm import ALGORITHMS, make_algorithm  # noqa: E402
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+DEFAULT_SIZES = (100, 1000, 10000, 100000)
+
+DEFAULT_QUANTUM = 4
+
+# A stage regresses when it is this much slower or bigger than the baseline
+DEFAULT_TOLERANCE = 0.5
+
+# Stages faster than this are too noisy to compare
+MIN_COMPARED_SECONDS = 0.05
+
+# Dashboards are only rendered for workloads up to this size
+DEFAULT_RENDER_LIMIT = 10000
+
+# Each stage is timed this many times and the fastest run is kept
+DEFAULT_REPEAT = 3
+
+
+def measure(function, trace_memory=True, repeat=DEFAULT_REPEAT):
+    """Time ``function`` and, optionally, measure its peak traced memory.
+
+    The timed calls run without tracing and the fastest is kept; the memory is
+    measured in one more, traced call so that tracemalloc does not distort
+    the timing.
+
+    Returns:
+        tuple: (result, seconds, peak memory in bytes or None).
+    """
+    seconds = None
+    for _ in range(max(1, repeat)):
+        result = None
+        gc.collect()
+        started = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - started
+        seconds = elapsed if seconds is None else min(seconds, elapsed)
+    peak = None
+    if trace_memory:
+        del result
+        gc.collect()
+        tracemalloc.start()
+        try:
+            result = function()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return result, seconds, peak
+
+
+def render_dashboard(schedule, metrics):
+    """Build every figure of the dashboard of one schedule."""
+    def colors(pid):
+        return "#1f77b4"
+
+    return (
+        build_gantt_figure(schedule),
+        build_bar_chart(metrics, metrics.turnaround, colors, "Turnaround", "Time"),
+        build_bar_chart(metrics, metrics.waiting, colors, "Waiting", "Time"),
+        build_utilization_chart(metrics, colors),
+    )
+
+
+def run_benchmarks(sizes, patterns, algorithms, config, quantum=DEFAULT_QUANTUM, seed=0,
+                   trace_memory=True, render_limit=DEFAULT_RENDER_LIMIT, repeat=DEFAULT_REPEAT, log=print):
+    """Run every benchmark case.
+
+    Returns:
+        dict: Mapping of "pattern/size/stage" to the measurements of that stage.
+    """
+    results = {}
+
+    def record(name, seconds, peak, processes, segments=None):
+        entry = {"seconds": round(seconds, 6), "processes_per_second": round(processes / seconds) if seconds else None}
+        if segments is not None:
+            entry["segments"] = segments
+            entry["segments_per_second"] = round(segments / seconds) if seconds else None
+        if peak is not None:
+            entry["peak_memory_bytes"] = peak
+        results[name] = entry
+        memory = f"{peak / 2**20:9.1f} MiB" if peak is not None else ""
+        log(f"{name:45s} {seconds:10.4f} s {entry['processes_per_second'] or 0:>12,} proc/s {memory}")
+
+    for pattern in patterns:
+        for size in sizes:
+            prefix = f"{pattern}/{size}"
+            workload, seconds, peak = measure(lambda: generate_workload(size, config, pattern, seed), trace_memory, repeat)
+            record(f"{prefix}/generate", seconds, peak, size)
+            for algorithm in algorithms:
+                scheduler = make_algorithm(algorithm, quantum)
+                schedule, seconds, peak = measure(lambda: scheduler.schedule(workload), trace_memory, repeat)
+                record(f"{prefix}/schedule/{algorithm}", seconds, peak, size, len(schedule))
+                metrics, seconds, peak = measure(lambda: schedule_metrics(schedule, workload), trace_memory, repeat)
+                record(f"{prefix}/metrics/{algorithm}", seconds, peak, size, len(schedule))
+                if size <= render_limit:
+                    _, seconds, peak = measure(lambda: render_dashboard(schedule, metrics), trace_memory, repeat)
+                    record(f"{prefix}/render/{algorithm}", seconds, peak, size, len(schedule))
+                # Release the arrays before the next run instead of holding two at once
+                schedule = metrics = None
+            workload = None
+    return results
+
+
+def compare_with_baseline(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """List the stages that regressed against the baseline.
+
+    A stage without a baseline entry, such as an algorithm added since the
+    baseline was recorded, counts as a regression when the baseline covers its
+    workload (pattern and size), so that it is not silently left unchecked.
+    Workloads the baseline does not cover at all are not compared.
+
+    Returns:
+        list: One message per regression.
+    """
+    covered = {_workload_prefix(name) for name in baseline}
+    regressions = []
+    for name, entry in results.items():
+        expected = baseline.get(name)
+        if expected is None:
+            if _workload_prefix(name) in covered:
+                regressions.append(f"{name}: no baseline entry, record one with --save-baseline")
+            continue
+        if entry["seconds"] >= MIN_COMPARED_SECONDS and entry["seconds"] > expected["seconds"] * (1 + tolerance):
+            regressions.append(f"{name}: {entry['seconds']:.4f} s, baseline {expected['seconds']:.4f} s")
+        peak, expected_peak = entry.get("peak_memory_bytes"), expected.get("peak_memory_bytes")
+        if peak is not None and expected_peak and peak > expected_peak * (1 + tolerance):
+            regressions.append(f"{name}: peak memory {peak / 2**20:.1f} MiB, baseline {expected_peak / 2**20:.1f} MiB")
+    return regressions
+
+
+def uncovered_workloads(results, baseline):
+    """Return the "pattern/size" workloads of ``results`` that the baseline has no entries for."""
+    covered = {_workload_prefix(name) for name in baseline}
+    return sorted({_workload_prefix(name) for name in results} - covered)
+
+
+def parameter_mismatches(report, baseline):
+    """List the run parameters that differ from those the baseline was recorded with.
+
+    Timings of runs with a different quantum, seed, generation ranges or
+    repeat count are not comparable, so any difference makes the comparison
+    meaningless.
+
+    Returns:
+        list: One message per differing parameter.
+    """
+    mismatches = []
+    for key in ("quantum", "seed", "repeat", "config"):
+        if report[key] != baseline.get(key):
+            mismatches.append(f"{key}: {report[key]}, baseline {baseline.get(key)}")
+    return mismatches
+
+
+def _workload_prefix(name):
+    return "/".join(name.split("/")[:2])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default=",".join(str(size) for size in DEFAULT_SIZES),
+                        help="comma separated workload sizes")
+    parser.add_argument("--patterns", default=",".join(ARRIVAL_PATTERNS),
+                        help="comma separated arrival patterns")
+    parser.add_argument("--algorithms", default=",".join(ALGORITHMS),
+                        help="comma separated algorithms")
+    parser.add_argument("--quantum", type=int, default=DEFAULT_QUANTUM)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--config", default=APP_CONFIG_PATH, help="settings file with the generation ranges")
+    for key in RANGE_KEYS:
+        parser.add_argument(f"--{key.replace('_', '-')}", metavar="LOW-HIGH", help=f"override {key}")
+    parser.add_argument("--render-limit", type=int, default=DEFAULT_RENDER_LIMIT,
+                        help="largest workload whose dashboard is rendered")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="timed runs per stage, the fastest is kept")
+    parser.add_argument("--no-memory", action="store_true", help="skip the traced peak memory runs")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline JSON to compare with")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="allowed slowdown or growth, as a fraction of the baseline")
+    parser.add_argument("--save-baseline", metavar="PATH", help="write the results as the new baseline")
+    parser.add_argument("--output", metavar="PATH", help="write the results to this JSON file")
+    args = parser.parse_args(argv)
+
+    overrides = {key: getattr(args, key) for key in RANGE_KEYS if getattr(args, key)}
+    config = read_app_config(args.config, overrides)
+    results = run_benchmarks(
+        [int(size) for size in args.sizes.split(",")],
+        args.patterns.split(","),
+        args.algorithms.split(","),
+        config,
+        quantum=args.quantum,
+        seed=args.seed,
+        trace_memory=not args.no_memory,
+        render_limit=args.render_limit,
+        repeat=args.repeat,
+    )
+    report = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "config": {key: list(value) for key, value in config.items()},
+        "quantum": args.quantum,
+        "seed": args.seed,
+        "repeat": args.repeat,
+        "results": results,
+    }
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, "w") as f:
+                json.dump(report, f, indent=2, sort_keys=True)
+
+    if args.save_baseline or not os.path.exists(args.baseline):
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    mismatches = parameter_mismatches(report, baseline)
+    if mismatches:
+        print(f"\nCANNOT COMPARE: {args.baseline} was recorded with different parameters; rerun with "
+              f"matching options or record a new baseline with --save-baseline:", file=sys.stderr)
+        for mismatch in mismatches:
+            print(f"  {mismatch}", file=sys.stderr)
+        return 2
+    for prefix in uncovered_workloads(results, baseline["results"]):
+        print(f"{prefix}: not in {args.baseline}, not compared")
+    regressions = compare_with_baseline(results, baseline["results"], args.tolerance)
+    if regressions:
+        print(f"\nPERFORMANCE REGRESSION: {len(regressions)} stage(s) exceed the baseline by more than "
+              f"{args.tolerance:.0%} or have no baseline:", file=sys.stderr)
+        for regression in regressions:
+            print(f"  {regression}", file=sys.stderr)
+        return 1
+    print(f"\nNo regressions against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
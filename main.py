@@ -1,33 +1,68 @@
-from flask import Flask, request, render_template, redirect, url_for
+from flask import Flask, Response, g, request, render_template, redirect, url_for, jsonify
 import dash
-from dash import dcc, html, dash_table
+from dash import dcc, html, Input, Output, State
+from dash.exceptions import PreventUpdate
 import pandas as pd
-import plotly.figure_factory as ff
-import plotly.colors
-import json
-import csv
-from Process import Process
+import functools
+import logging
+import os
+from urllib.parse import parse_qs
+from Comparison import COMPARED_ALGORITHMS, SWEPT_ALGORITHMS, parse_quanta, run_comparison, run_sweep_jobs
+from Charts import build_bar_chart, build_sweep_figure, build_utilization_chart
+from Gantt import MAX_DETAILED_SEGMENTS, build_gantt_figure
+from Generator import generate_workload
+from Ingest import read_workload
+from Instrumentation import PhaseHistograms, RequestTimer
+from Metrics import schedule_metrics
+from ProcessTable import ProcessTable
 from Scheduler import Scheduler
-from io import TextIOWrapper
-import time  # Import the time module
-import SchedulingAlgorithm 
-from SchedulingAlgorithm import FCFS as FCFS
-from SchedulingAlgorithm import SJF as SJF
-from SchedulingAlgorithm import Priority as Priority
-from SchedulingAlgorithm import PriorityRR as PriorityRR
-from SchedulingAlgorithm import RR as RR
+from SchedulingAlgorithm import make_algorithm
+from ResultCache import DEFAULT_MAX_BYTES, DEFAULT_MAX_DISK_BYTES, ResultCache, workload_digest
+from ResultStore import make_result_store
 import hashlib
 import dash_bootstrap_components as dbc
-import plotly.graph_objs as go
 
 PLOTLY_LOGO = "https://images.plot.ly/logo/new-branding/plotly-logomark.png"
 
+# Limits on uploaded workloads
+MAX_UPLOAD_ROWS = 50000000
+MAX_UPLOAD_BYTES = 2 * 1024 ** 3
+MAX_GENERATED_PROCESSES = 50000000
+
+# Rows of the process table rendered on the dashboard
+MAX_TABLE_ROWS = 1000
+
+# Schedules already computed for a workload, algorithm and quantum
+result_cache = ResultCache(max_bytes=int(os.environ.get("SCHEDULER_CACHE_BYTES", DEFAULT_MAX_BYTES)),
+                           directory=os.environ.get("SCHEDULER_CACHE_DIR"),
+                           max_disk_bytes=int(os.environ.get("SCHEDULER_CACHE_DISK_BYTES", DEFAULT_MAX_DISK_BYTES)))
+
+# Logging is off unless SCHEDULER_LOG_LEVEL is set, e.g. to INFO or DEBUG
+logging.basicConfig(level=os.environ.get("SCHEDULER_LOG_LEVEL", "WARNING").upper(),
+                    format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+logger = logging.getLogger("scheduler")
+
+# Latency of each request phase, exported at /metrics
+phase_histograms = PhaseHistograms()
+
+# Send the phase breakdown of every request in a Server-Timing header, not only on request
+DEBUG_TIMINGS = os.environ.get("SCHEDULER_DEBUG_TIMINGS") == "1"
+
 # Initialize Flask app
 app = Flask(__name__)
 
-dash_app = dash.Dash(__name__, server=app, url_base_pathname='/dashboard/',external_stylesheets=[dbc.themes.BOOTSTRAP])
-dash_app.layout = html.Div(id='output')
+dash_app = dash.Dash(__name__, server=app, url_base_pathname='/dashboard/',external_stylesheets=[dbc.themes.BOOTSTRAP],
+                     suppress_callback_exceptions=True)
+# The dashboard renders whichever run is named in its URL (?run=<id>)
+dash_app.layout = html.Div([dcc.Location(id='url'), html.Div(id='output')])
+
+# Results of each scheduling request, looked up by run id
+result_store = make_result_store(os.environ.get("SCHEDULER_RUN_DIR"))
 
+# Seconds a comparison or sweep waits for its algorithms; 0 waits for all of them
+COMPARISON_TIMEOUT = float(os.environ.get("SCHEDULER_COMPARISON_TIMEOUT", 60)) or None
+
+@functools.lru_cache(maxsize=65536)
 def generate_color(process_name):
     """
     Generate a color based on the process name.
@@ -38,98 +73,51 @@ def generate_color(process_name):
     Returns:
         str: Hexadecimal color code.
     """
-    hash_object = hashlib.sha256(process_name.encode())
+    hash_object = hashlib.sha256(str(process_name).encode())
     hex_dig = hash_object.hexdigest()[:6]
     return '#' + hex_dig
 
-def render_gantt_chart(processes, start_times, durations, app_layout,algorithm=None):
+def render_gantt_chart(schedule, app_layout,algorithm=None, colors=None):
     """
     Render a Gantt chart visualizing the job scheduling.
 
     Args:
-        processes (list): List of process names.
-        start_times (list): List of start times for each process.
-        durations (list): List of durations for each process.
+        schedule (Schedule): The schedule to draw.
         app_layout (list): List representing the layout of the Dash app.
         algorithm (str, optional): The scheduling algorithm used. Defaults to None.
+        colors (callable, optional): Returns the color of a process name. Defaults to generate_color().
     """
-    tasks = []
-    colors = [generate_color(process_name) for process_name in processes]
-    color_dict = {process: color for process, color in zip(processes, colors)} 
-    for name, start, duration, color in zip(processes, start_times, durations, colors):
-        start = float(start)
-        tasks.append({'Task': name, 'Start': start, 'Finish': start + float(duration), 'Resource': name})
-    title='Job Scheduling Gantt Chart'
-    fig = ff.create_gantt(tasks, index_col='Task', title=title, group_tasks=True, show_colorbar=True, colors=color_dict)
-    fig.update_layout(xaxis_type='linear')
+    fig = build_gantt_figure(schedule, colors=colors or generate_color)
     app_layout.append(dcc.Graph(id='job-gantt-chart', figure=fig))
 
-def render_turnaround_time_chart(processes, start_times, durations, arrival_times, app_layout):
+def render_turnaround_time_chart(metrics, colors, app_layout):
     """
     Render a bar chart showing the turnaround time for each process.
 
     Args:
-        processes (list): List of process names.
-        start_times (list): List of start times for each process.
-        durations (list): List of durations for each process.
-        arrival_times (dict): Dictionary mapping process names to their arrival times.
+        metrics (ScheduleMetrics): Per-process metrics of the schedule.
+        colors (callable): Returns the color of a process name.
         app_layout (list): List representing the layout of the Dash app.
     """
-    termination_times={processes[i]:0 for i in range(len(processes))}
-    for p in processes:
-        for i in range(len(processes)):
-            if processes[i]==p:
-                termination_times[p]=max(start_times[i]+durations[i],termination_times[p])
-    turnaround_times = {process: termination_times[process] - arrival_times[process] for process in processes}
-    colors={process:generate_color(process) for process in processes}
-    data = []
-    for p in turnaround_times:
-        data.append(go.Bar(name=p, x=[p], y=[turnaround_times[p]], marker_color=colors[p]))
-    layout = go.Layout(
-        title='Turnaround Time for Each Process',
-        xaxis=dict(title='Process'),
-        yaxis=dict(title='Turnaround Time'),
-        barmode='group'
-    )
-    fig = go.Figure(data=data, layout=layout)
-    app_layout.append(dcc.Graph(id='waiting-time-chart', figure=fig))
+    fig = build_bar_chart(metrics, metrics.turnaround, colors, 'Turnaround Time for Each Process', 'Turnaround Time')
+    app_layout.append(dcc.Graph(id='turnaround-time-chart', figure=fig))
 
-def render_waiting_time_chart(processes, start_times, durations, arrival_times, app_layout):
+def render_waiting_time_chart(metrics, colors, app_layout):
     """
     Render a bar chart showing the waiting time for each process.
 
     Args:
-        processes (list): List of process names.
-        start_times (list): List of start times for each process.
-        durations (list): List of durations for each process.
-        arrival_times (dict): Dictionary mapping process names to their arrival times.
+        metrics (ScheduleMetrics): Per-process metrics of the schedule.
+        colors (callable): Returns the color of a process name.
         app_layout (list): List representing the layout of the Dash app.
     """
-    waiting_times= {process: 0 for process in processes}
-    for p in set(processes):
-        last_run=arrival_times[p]
-        for i in range(len(processes)):
-            if processes[i]==p:
-                waiting_times[p]+=(start_times[i]-last_run)
-                last_run=start_times[i]+durations[i]
-    colors={process:generate_color(process) for process in processes}
-    data = []
-    for p in waiting_times:
-        data.append(go.Bar(name=p, x=[p], y=[waiting_times[p]], marker_color=colors[p]))
-    layout = go.Layout(
-        title='Waiting Time for Each Process',
-        xaxis=dict(title='Process'),
-        yaxis=dict(title='Waiting Time'),
-        barmode='group'
-    )
-    fig = go.Figure(data=data, layout=layout)
+    fig = build_bar_chart(metrics, metrics.waiting, colors, 'Waiting Time for Each Process', 'Waiting Time')
     app_layout.append(dcc.Graph(id='waiting-time-chart', figure=fig))
-    average_waiting_time = sum(waiting_times.values()) / len(waiting_times)
     app_layout.append(html.P(
         children=[
             html.Span("Average Waiting Time: ", style={"font-size": "1.25rem"}),  # Text with increased font size
             html.Span(
-                f"{average_waiting_time:.2f}",  # Numerical value with two decimal places
+                f"{metrics.average_waiting_time:.2f}",  # Numerical value with two decimal places
                 style={"font-size": "1.5rem", "color": "red", "margin-left": "8px"}  # Increased font size, red color, and margin between the text and numerical value
             )
         ],
@@ -137,67 +125,50 @@ def render_waiting_time_chart(processes, start_times, durations, arrival_times,
     ))
 
 
-def render_cpu_utilization_chart(processes, durations, app_layout):
+def render_cpu_utilization_chart(metrics, colors, app_layout):
     """
     Render a pie chart showing CPU utilization per process.
 
     Args:
-        processes (list): List of process names.
-        durations (list): List of durations for each process.
+        metrics (ScheduleMetrics): Per-process metrics of the schedule.
+        colors (callable): Returns the color of a process name.
         app_layout (list): List representing the layout of the Dash app.
     """
-    total_cpu_time = sum(durations)
-    cpu_utilization = {process: 0 for process in processes}
-    for i in range(len(processes)):
-        cpu_utilization[processes[i]] += durations[i]
-    cpu_utilization_percentage = {process: (time / total_cpu_time) * 100 for process, time in cpu_utilization.items()}
-    labels = list(cpu_utilization_percentage.keys())
-    values = list(cpu_utilization_percentage.values())
-    colors = [generate_color(process) for process in labels]
-    fig = go.Figure(data=[go.Pie(labels=labels, values=values, hole=0.3, marker=dict(colors=colors))])
-    fig.update_layout(title='CPU Utilization Per Process')
+    fig = build_utilization_chart(metrics, colors)
     app_layout.append(dcc.Graph(id='cpu-utilization-chart', figure=fig))
 
-def render_process_table(processes, start_times, durations, arrival_times, app_layout):
+def render_process_table(metrics, app_layout):
     """
     Render a table showing process details.
 
     Args:
-        processes (list): List of process names.
-        start_times (list): List of start times for each process.
-        durations (list): List of durations for each process.
-        arrival_times (dict): Dictionary mapping process names to their arrival times.
+        metrics (ScheduleMetrics): Per-process metrics of the schedule.
         app_layout (list): List representing the layout of the Dash app.
     """
-    start_time_dict = {process: start_times[i] for i, process in enumerate(processes)}
-    durations_dict = {process: 0 for process in processes}
-    for i, process in enumerate(processes):
-        start_time_dict[process] = min(start_time_dict[process], start_times[i])
-        durations_dict[process] += durations[i]
-    termination_times={processes[i]:0 for i in range(len(processes))}
-    for p in processes:
-        for i in range(len(processes)):
-            if processes[i]==p:
-                termination_times[p]=max(start_times[i]+durations[i],termination_times[p])
-    turnaround_times = {process: termination_times[process] - arrival_times[process] for process in processes}
-    colors = {process: generate_color(process) for process in processes}
-    processes = list(set(processes))
+    # Only the first rows are rendered; the averages still cover every process
+    shown = metrics.head(MAX_TABLE_ROWS)
     data = {
-        "Process": processes,
-        "Arrival Time": [arrival_times[process] for process in processes],
-        "Burst Time": [durations_dict[process] for process in processes],
-        "Start Time": [start_time_dict[process] for process in processes],
-        "Finish Time": [turnaround_times[process] + arrival_times[process] for process in processes],
-        "Turnaround Time": [turnaround_times[process] for process in processes]
+        "Process": shown.pids,
+        "Arrival Time": shown.arrival_times,
+        "Burst Time": shown.burst,
+        "Start Time": shown.first_start,
+        "Finish Time": shown.finish,
+        "Turnaround Time": shown.turnaround,
+        "Waiting Time": shown.waiting,
+        "Response Time": shown.response
     }
     table = dbc.Table.from_dataframe(pd.DataFrame(data), striped=True, bordered=True, hover=True)
+    note = []
+    if len(shown) < len(metrics):
+        note = [html.P(f"Showing the first {len(shown)} of {len(metrics)} processes, in order of first dispatch.", className="px-4 text-muted")]
     app_layout.append(html.Div([
     html.Div(table, className="p-4"),  # Add padding
+    *note,
     html.P(
         children=[
             html.Span("Average Turnaround Time: ", style={"font-size": "1.25rem"}),  # Text with increased font size
             html.Span(
-                f"{sum(turnaround_times.values()) / len(turnaround_times):.2f}",  # Numerical value with two decimal places
+                f"{metrics.average_turnaround_time:.2f}",  # Numerical value with two decimal places
                 style={"font-size": "1.5rem", "color": "red", "margin-left": "8px"}  # Increased font size, red color, and margin between the text and numerical value
             )
         ],
@@ -262,30 +233,111 @@ def add_footer(app_layout):
     footer = html.Footer("Process Scheduling Visualizer 2024", className="footer text-center fixed-bottom bg-dark text-light")
     app_layout.append(footer)
 
-def render(processes=[], start_times=[], durations=[], arrival_times={}):
+def render(schedule, metrics):
     """
-    Render the Dash app with the given process data.
+    Render the dashboard for the given schedule.
 
     Args:
-        processes (list): List of process names.
-        start_times (list): List of start times for each process.
-        durations (list): List of durations for each process.
-        arrival_times (dict): Dictionary mapping process names to their arrival times.
+        schedule (Schedule): The schedule to show.
+        metrics (ScheduleMetrics): Per-process metrics of the schedule.
+
+    Returns:
+        html.Div: The dashboard layout.
     """
     app_layout = []
     add_header(app_layout)
-    render_gantt_chart(processes, start_times, durations, app_layout)
-    render_turnaround_time_chart(processes, start_times,durations,arrival_times, app_layout)
-    render_process_table(processes, start_times, durations,arrival_times, app_layout)
-    render_waiting_time_chart(processes, start_times, durations, arrival_times, app_layout)
-    render_cpu_utilization_chart(processes, durations, app_layout)
+    # Colors are only computed for the processes a chart draws individually
+    render_gantt_chart(schedule, app_layout, colors=generate_color)
+    render_turnaround_time_chart(metrics, generate_color, app_layout)
+    render_process_table(metrics, app_layout)
+    render_waiting_time_chart(metrics, generate_color, app_layout)
+    render_cpu_utilization_chart(metrics, generate_color, app_layout)
     add_footer(app_layout)
-    dash_app.layout = html.Div(app_layout)
+    return html.Div(app_layout)
+
 
 
 
 
 
+def request_timer(endpoint=None):
+    """
+    Return the phase timer of the current request, creating it on first use.
+
+    Args:
+        endpoint (str, optional): Name of the endpoint in the metrics. Defaults to the request path.
+
+    Returns:
+        RequestTimer: The timer, recorded into /metrics when the request finishes.
+    """
+    if 'timer' not in g:
+        g.timer = RequestTimer(endpoint or request.path)
+    return g.timer
+
+@app.after_request
+def record_phases(response):
+    """
+    Record the phases of the finished request and, when asked, report them in a header.
+
+    Requests with an ``X-Debug-Timings`` header (or every request when
+    SCHEDULER_DEBUG_TIMINGS=1) get a Server-Timing header with the duration of
+    each phase.
+
+    Returns:
+        Response: The response.
+    """
+    timer = g.pop('timer', None)
+    if timer is None or not timer.phases:
+        return response
+    timer.finish(phase_histograms)
+    breakdown = timer.server_timing()
+    logger.debug("%s algorithm=%s size=%s phases: %s", timer.endpoint, timer.algorithm, timer.size, breakdown)
+    if DEBUG_TIMINGS or 'X-Debug-Timings' in request.headers:
+        response.headers['Server-Timing'] = breakdown
+    return response
+
+@app.route('/metrics')
+def metrics_endpoint():
+    """
+    Endpoint exposing the request phase latency histograms to Prometheus.
+
+    Returns:
+        Response: The histograms in the Prometheus text format.
+    """
+    return Response(phase_histograms.render_prometheus(), mimetype='text/plain; version=0.0.4')
+
+def run_schedule(processes, algorithm, quantum=None, timer=None):
+    """
+    Schedule processes through the result cache.
+
+    Args:
+        processes (ProcessTable): The workload to schedule.
+        algorithm (str): Short name of the scheduling algorithm.
+        quantum (int, optional): Time quantum for the round robin algorithms.
+        timer (RequestTimer, optional): Timer of the schedule and metrics phases.
+
+    Returns:
+        tuple: The Schedule and its ScheduleMetrics.
+    """
+    timer = timer or RequestTimer(None)
+    timer.algorithm = algorithm
+    timer.size = len(processes)
+    scheduling_algorithm = make_algorithm(algorithm, quantum)
+    with timer.phase('schedule'):
+        key = result_cache.make_key(workload_digest(processes), algorithm, quantum)
+        result = result_cache.get(key)
+        if result is None:
+            scheduler = Scheduler()
+            scheduler.set_algorithm(scheduling_algorithm)
+            scheduler.set_processes(processes)
+            result_schedule = scheduler.run()
+    if result is None:
+        with timer.phase('metrics'):
+            result = (result_schedule, schedule_metrics(result_schedule, processes))
+        result_cache.put(key, result)
+    else:
+        logger.info("Cache hit for %s on %d processes", algorithm, len(processes))
+    return result
 
 @app.route('/schedule', methods=['POST'])
 def schedule():
@@ -295,40 +347,29 @@ def schedule():
     Returns:
         Response: Redirects to the dashboard.
     """
-    job_data = request.json
-    print(job_data)
+    timer = request_timer()
+    with timer.phase('parse'):
+        job_data = request.json
     algorithm = job_data[-1]['algorithm']
-    if(algorithm == 'RR' or algorithm == 'PriorityRR'):
-        quantum = int(job_data[-1]['quantum'])
-    scheduler = Scheduler()
-    # Initialize the scheduling algorithm based on the selected algorithm
-    if algorithm == 'FCFS':
-        algo=FCFS()
-    elif algorithm == 'SJF':
-        algo=SJF()
-    elif algorithm == 'Priority':
-        algo=Priority()
-    elif algorithm == 'RR':
-         algo=RR(quantum)
-    elif algorithm == 'PriorityRR':
-        algo=PriorityRR(quantum)
-    scheduler.set_algorithm(algo)
+    quantum = job_data[-1].get('quantum')
     job_data.pop()
-    process_names = [job['pid'] for job in job_data]
-    arrival_times = [job['arrival_time'] for job in job_data]
-    arrival_time_dict = {name: arrival for name, arrival in zip(process_names, arrival_times)}
-    durations = [job['burst_time'] for job in job_data]
-    priorities = [job['priority'] for job in job_data]
-    processes = [Process(name, int(arrival),int(duration)) for name, arrival, duration in zip(process_names, arrival_times, durations)]
-    if algorithm == 'Priority' or algorithm == "PriorityRR":
-        for process, priority in zip(processes, priorities):
-            process.priority = int(priority)
-    print(processes)
-    scheduler.set_processes(processes)
-    process_names,start_times,durations= scheduler.run()
-    print(start_times)
-    render(process_names, start_times, durations, arrival_time_dict)
-    return redirect(url_for('render_dashboard'))
+    logger.debug("Received %d processes for %s", len(job_data), algorithm)
+    try:
+        with timer.phase('build'):
+            priorities = None
+            if algorithm == 'Priority' or algorithm == "PriorityRR":
+                priorities = [int(job['priority']) for job in job_data]
+            processes = ProcessTable([job['pid'] for job in job_data],
+                                     [int(job['arrival_time']) for job in job_data],
+                                     [int(job['burst_time']) for job in job_data],
+                                     priorities)
+        result_schedule, metrics = run_schedule(processes, algorithm, quantum, timer)
+    except (TypeError, ValueError) as e:
+        logger.info("Rejected /schedule request: %s", e)
+        return f"Error: {str(e)}"
+    with timer.phase('serialize'):
+        run_id = result_store.save({'kind': 'schedule', 'algorithm': algorithm, 'schedule': result_schedule, 'metrics': metrics})
+    return redirect(url_for('render_dashboard', run=run_id))
 
 @app.route('/upload', methods=['POST'])
 def processFile():
@@ -343,57 +384,22 @@ def processFile():
     file = request.files['file']
     if file.filename == '':
         return redirect(request.url)
+    timer = request_timer()
     try:
-        file_wrapper = TextIOWrapper(file, encoding='utf-8')
-
-        # Read CSV file
-        job_data = []
-        csv_reader = csv.reader(file_wrapper)
-        for row in csv_reader:
-            try:
-                if len(row) == 3:
-                    pid, arrival_time, burst_time = row
-                    job_data.append({'pid': pid, 'arrival_time': int(arrival_time), 'burst_time': int(burst_time), 'priority': None})
-                else:
-                    pid, arrival_time, burst_time, priority = row
-                    priority = int(priority) if priority != 'None' else None
-                    job_data.append({'pid': pid, 'arrival_time': int(arrival_time), 'burst_time': int(burst_time), 'priority': priority})
-            except ValueError:
-                return "Error: Incorrect data format in CSV file."
+        with timer.phase('parse'):
+            processes = read_workload(file.stream, max_rows=MAX_UPLOAD_ROWS, max_bytes=MAX_UPLOAD_BYTES)
     except Exception as e:
+        logger.info("Rejected upload %s: %s", file.filename, e)
         return f"Error: {str(e)}"
     algorithm = request.form['algorithm']
-    scheduler = Scheduler()
-
-    # Initialize the scheduling algorithm based on the selected algorithm
-    if algorithm == 'FCFS':
-        algorithm = FCFS()
-    elif algorithm == 'SJF':
-        algorithm = SJF()
-    elif algorithm == 'Priority':
-        algorithm = Priority()
-    elif algorithm == 'RR':
-        if request.form["quantum"]:
-            quantum = int(request.form["quantum"])
-        algorithm = RR(quantum)
-    elif algorithm == 'PriorityRR':
-        if request.form["quantum"]:
-            quantum = int(request.form["quantum"])
-        algorithm = PriorityRR(quantum)
-    else:
-        return algorithm
-    scheduler.set_algorithm(algorithm)
-    process_names = [job['pid'] for job in job_data]
-    arrival_times = [job['arrival_time'] for job in job_data]
-    arrival_time_dict = {name: arrival for name, arrival in zip(process_names, arrival_times)}
-    durations = [job['burst_time'] for job in job_data]
-    priorities = [job['priority'] for job in job_data]
-    processes = [Process(name, int(arrival), int(duration), priority=priority) for name, arrival, duration, priority in zip(process_names, arrival_times, durations, priorities)]
-    scheduler.set_processes(processes)
-    process_names, start_times, durations = scheduler.run()
-    print("Arrival Time Dict: ", arrival_time_dict)
-    render(process_names, start_times, durations, arrival_time_dict)
-    return redirect(url_for('render_dashboard'))
+    try:
+        result_schedule, metrics = run_schedule(processes, algorithm, request.form.get("quantum"), timer)
+    except ValueError as e:
+        logger.info("Rejected /upload request: %s", e)
+        return f"Error: {str(e)}"
+    with timer.phase('serialize'):
+        run_id = result_store.save({'kind': 'schedule', 'algorithm': algorithm, 'schedule': result_schedule, 'metrics': metrics})
+    return redirect(url_for('render_dashboard', run=run_id))
 
 @app.route('/')
 def index():
@@ -433,7 +439,38 @@ def random():
     Returns:
         str: Rendered HTML page.
     """
-    return render_template('generate.html')
+    return render_template('generate.html', max_processes=MAX_GENERATED_PROCESSES)
+
+@app.route('/generate', methods=['POST'])
+def generateWorkload():
+    """
+    Endpoint to generate a random workload on the server and schedule it.
+
+    The request is JSON with num_processes, algorithm and optionally quantum,
+    pattern (uniform, bursty or heavy_tailed) and seed. Processes are drawn
+    with the ranges of APP_CONFIG.txt.
+
+    Returns:
+        Response: JSON with the run id and the URL of its dashboard.
+    """
+    timer = request_timer()
+    options = request.json or {}
+    algorithm = options.get('algorithm')
+    try:
+        count = int(options.get('num_processes', 0))
+        if count > MAX_GENERATED_PROCESSES:
+            raise ValueError(f"At most {MAX_GENERATED_PROCESSES} processes can be generated")
+        seed = options.get('seed')
+        with timer.phase('build'):
+            processes = generate_workload(count, pattern=options.get('pattern', 'uniform'),
+                                          seed=None if seed in (None, '') else int(seed))
+        result_schedule, metrics = run_schedule(processes, algorithm, options.get('quantum'), timer)
+    except (TypeError, ValueError) as e:
+        logger.info("Rejected /generate request: %s", e)
+        return f"Error: {str(e)}", 400
+    with timer.phase('serialize'):
+        run_id = result_store.save({'kind': 'schedule', 'algorithm': algorithm, 'schedule': result_schedule, 'metrics': metrics})
+    return jsonify(run_id=run_id, dashboard=url_for('render_dashboard', run=run_id))
 
 @app.route('/dashboard/')
 def render_dashboard():
@@ -455,6 +492,16 @@ def compare():
     """
     return render_template('compare.html')
 
+@app.route('/sweep')
+def sweep():
+    """
+    Endpoint for the quantum sweep page.
+
+    Returns:
+        str: Rendered HTML page.
+    """
+    return render_template('sweep.html')
+
 @app.route('/documentation')
 def documentation():
     """
@@ -465,83 +512,149 @@ def documentation():
     """
     return render_template('documentation.html')
 
-def render_comparison_box(title, processes, start_times, durations, arrival_times, app_layout):
+def render_comparison_box(title, result, app_layout):
     """
     Render comparison box for each scheduling algorithm.
 
     Args:
         title (str): Title of the comparison box.
-        processes (list): List of process names.
-        start_times (list): List of start times for each process.
-        durations (list): List of durations for each process.
-        arrival_times (dict): Dictionary mapping process names to their arrival times.
+        result (ComparisonResult): Summary of the algorithm's run.
         app_layout (list): List representing the layout of the Dash app.
     """
-    termination_times = {processes[i]: 0 for i in range(len(processes))}
-    waiting_times = {process: 0 for process in processes}
-    start_time_dict = {process: start_times[i] for i, process in enumerate(processes)}
-    durations_dict = {process: 0 for process in processes}
-
-    for p in processes:
-        for i in range(len(processes)):
-            if processes[i] == p:
-                termination_times[p] = max(start_times[i] + durations[i], termination_times[p])
-
-    for p in set(processes):
-        last_run = arrival_times[p]
-        for i in range(len(processes)):
-            if processes[i] == p:
-                waiting_times[p] += (start_times[i] - last_run)
-                last_run = start_times[i] + durations[i]
-
-    for i, process in enumerate(processes):
-        start_time_dict[process] = min(start_time_dict[process], start_times[i])
-        durations_dict[process] += durations[i]
-
-    turnaround_times = {process: termination_times[process] - arrival_times[process] for process in processes}
-
-    # Calculate average waiting time and average turnaround time
-    average_waiting_time = sum(waiting_times.values()) / len(waiting_times)
-    average_turnaround_time = sum(turnaround_times.values()) / len(turnaround_times)
-
     if title == "FCFS":
         title = "First Come First Served (FCFS)"
     elif title == "SJF":
         title = "Shortest Job First (SJF)"
-    elif title == "P":
+    elif title == "SRTF":
+        title = "Shortest Remaining Time First (SRTF)"
+    elif title == "Priority":
         title = "Priority Scheduling"
     elif title == "RR":
         title = "Round Robin (RR)"
+    elif title == "MLFQ":
+        title = "Multilevel Feedback Queue (MLFQ)"
     else:
         title = "Priority Scheduling with Round Robin (PriorityRR)"
 
+    if result.error is not None:
+        details = [html.P(f"Error: {result.error}", className="lead p-3")]
+    else:
+        details = [
+            html.P(f"Average Turnaround Time: {result.average_turnaround_time}", className="lead p-3"),
+            html.P(f"Average Waiting Time: {result.average_waiting_time}", className="lead p-3"),
+            html.P(f"Average Response Time: {result.average_response_time}", className="lead p-3")
+        ]
+
     # Add elements to the app layout
     app_layout.append(html.Div([
         html.H3(html.Strong(title), className="text-center mb-4 lead p-3"),
-        html.Div([
-            html.P(f"Average Turnaround Time: {average_turnaround_time}", className="lead p-3"),
-            html.P(f"Average Waiting Time: {average_waiting_time}", className="lead p-3")
-        ], className="text-center")
+        html.Div(details, className="text-center")
     ], className="border rounded p-4 mb-4", style={"margin": "16px 360px 16px 360px"}))
 
 
-def renderComparison(processes={}, start_times={}, durations={}, arrival_times={}):
+def renderComparison(results={}):
     """
     Render comparison page for different scheduling algorithms.
 
     Args:
-        processes (dict): Dictionary of processes for each algorithm.
-        start_times (dict): Dictionary of start times for each algorithm.
-        durations (dict): Dictionary of durations for each algorithm.
-        arrival_times (dict): Dictionary of arrival times for each algorithm.
+        results (dict): Dictionary mapping each algorithm to its ComparisonResult.
+
+    Returns:
+        html.Div: The comparison layout.
+    """
+    app_layout = []
+    add_header(app_layout)
+    for key in results:
+        render_comparison_box(key, results[key], app_layout)
+    add_footer(app_layout)
+    return html.Div(app_layout)
+
+
+def renderSweep(results={}):
+    """
+    Render the curves of a quantum sweep.
+
+    Args:
+        results (dict): Mapping of algorithm name to its ComparisonResults, one per quantum.
+
+    Returns:
+        html.Div: The sweep layout.
     """
     app_layout = []
     add_header(app_layout)
-    print(processes)
-    for key in processes:
-        render_comparison_box(key, processes[key], start_times[key], durations[key], arrival_times[key], app_layout)
+    for algorithm, points in results.items():
+        errors = sorted({point.error for point in points if point.error is not None})
+        for error in errors:
+            app_layout.append(html.P(f"{algorithm}: Error: {error}", className="lead p-3 text-center"))
+    times = {'average_waiting_time': 'Waiting', 'average_turnaround_time': 'Turnaround', 'average_response_time': 'Response'}
+    fig = build_sweep_figure(results, times, 'Average Times per Time Quantum', 'Time')
+    app_layout.append(dcc.Graph(id='sweep-times-chart', figure=fig))
+    fig = build_sweep_figure(results, {'context_switches': 'Context Switches'}, 'Context Switches per Time Quantum', 'Context Switches')
+    app_layout.append(dcc.Graph(id='sweep-switches-chart', figure=fig))
     add_footer(app_layout)
-    dash_app.layout = html.Div(app_layout)
+    return html.Div(app_layout)
+
+
+@dash_app.callback(Output('job-gantt-chart', 'figure'), Input('job-gantt-chart', 'relayoutData'),
+                   State('url', 'search'), prevent_initial_call=True)
+def zoom_gantt_chart(relayout_data, search):
+    """
+    Redraw an aggregated Gantt chart at the detail of the zoomed-in time range.
+
+    Args:
+        relayout_data (dict): Zoom or pan event of the Gantt chart.
+        search (str): Query string of the dashboard URL, e.g. "?run=<id>".
+
+    Returns:
+        go.Figure: The Gantt chart for the visible time range.
+    """
+    run_id = parse_qs((search or '').lstrip('?')).get('run', [None])[0]
+    run = result_store.load(run_id) if run_id else None
+    if not relayout_data or run is None or run['kind'] != 'schedule':
+        raise PreventUpdate
+    if len(run['schedule']) <= MAX_DETAILED_SEGMENTS:
+        # Small schedules are always drawn in full detail
+        raise PreventUpdate
+    if 'xaxis.range[0]' in relayout_data:
+        x_range = (float(relayout_data['xaxis.range[0]']), float(relayout_data['xaxis.range[1]']))
+    elif relayout_data.get('xaxis.autorange'):
+        x_range = None
+    else:
+        raise PreventUpdate
+    fig = build_gantt_figure(run['schedule'], x_range=x_range, colors=generate_color)
+    fig.update_layout(uirevision=run_id)
+    return fig
+
+
+@dash_app.callback(Output('output', 'children'), Input('url', 'search'))
+def render_run(search):
+    """
+    Render the dashboard of the run named in the page URL.
+
+    Args:
+        search (str): Query string of the dashboard URL, e.g. "?run=<id>".
+
+    Returns:
+        html.Div: The layout of the run, or a notice if it is unknown.
+    """
+    run_id = parse_qs((search or '').lstrip('?')).get('run', [None])[0]
+    timer = request_timer('/dashboard')
+    with timer.phase('serialize'):
+        run = result_store.load(run_id) if run_id else None
+    if run is None:
+        app_layout = []
+        add_header(app_layout)
+        app_layout.append(html.P("No results found for this run. Schedule some processes first.", className="lead p-4 text-center"))
+        add_footer(app_layout)
+        return html.Div(app_layout)
+    if run['kind'] == 'comparison':
+        return renderComparison(run['results'])
+    if run['kind'] == 'sweep':
+        return renderSweep(run['results'])
+    timer.algorithm = run.get('algorithm')
+    timer.size = len(run['metrics'])
+    with timer.phase('render'):
+        return render(run['schedule'], run['metrics'])
 
 
 
@@ -558,120 +671,78 @@ def comparison():
     file = request.files['file']
     if file.filename == '':
         return redirect(request.url)
+    timer = request_timer()
     try:
-        file_wrapper = TextIOWrapper(file, encoding='utf-8')
-
-        # Read CSV file
-        job_data = []
-        csv_reader = csv.reader(file_wrapper)
-        for row in csv_reader:
-            try:
-                if len(row) == 3:
-                    pid, arrival_time, burst_time = row
-                    job_data.append({'pid': pid, 'arrival_time': int(arrival_time), 'burst_time': int(burst_time), 'priority': None})
-                else:
-                    pid, arrival_time, burst_time, priority = row
-                    priority = int(priority) if priority != 'None' else None
-                    job_data.append({'pid': pid, 'arrival_time': int(arrival_time), 'burst_time': int(burst_time), 'priority': priority})
-            except ValueError:
-                return "Error: Incorrect data format in CSV file."
+        with timer.phase('parse'):
+            processes = read_workload(file.stream, max_rows=MAX_UPLOAD_ROWS, max_bytes=MAX_UPLOAD_BYTES)
     except Exception as e:
+        logger.info("Rejected comparison upload %s: %s", file.filename, e)
         return f"Error: {str(e)}"
+    timer.size = len(processes)
+
+    try:
+        quantum = int(request.form["quantum"])
+    except ValueError as e:
+        return f"Error: {str(e)}"
+
+    # Only algorithms without a cached summary are run
+    digest = workload_digest(processes)
+    keys = {algorithm: result_cache.make_key(digest, algorithm, quantum, kind="summary") for algorithm in COMPARED_ALGORITHMS}
+    results = {algorithm: result_cache.get(key) for algorithm, key in keys.items()}
+    missing = tuple(algorithm for algorithm, result in results.items() if result is None)
+    if missing:
+        for algorithm, result in run_comparison(processes, quantum, algorithms=missing, timeout=COMPARISON_TIMEOUT).items():
+            results[algorithm] = result
+            for phase, seconds in (result.phase_times or {}).items():
+                timer.add(phase, seconds, algorithm)
+            if result.error != "Timed out":
+                result_cache.put(keys[algorithm], result)
+
+    with timer.phase('serialize'):
+        run_id = result_store.save({'kind': 'comparison', 'results': results})
+    return redirect(url_for('render_dashboard', run=run_id))
 
-    schedulerFCFS = Scheduler()
-    schedulerSJF = Scheduler()
-    schedulerP = Scheduler()
-    schedulerRR = Scheduler()
-    schedulerPRR = Scheduler()
-
-    fcfs = FCFS()
-    sjf = SJF()
-    priori = Priority()
-    rr = RR(int(request.form["quantum"]))
-    prioriRR = PriorityRR(int(request.form["quantum"]))
-
-    processes2 = dict()
-    start_times2 = dict()
-    durations2 = dict()
-    arrival_times2 = dict()
-
-    schedulerFCFS.set_algorithm(fcfs)
-    process_names = [job['pid'] for job in job_data]
-    arrival_times = [job['arrival_time'] for job in job_data]
-    arrival_time_dict = {name: arrival for name, arrival in zip(process_names, arrival_times)}
-    durations = [job['burst_time'] for job in job_data]
-    priorities = [job['priority'] for job in job_data]
-    processes = [Process(name, int(arrival), int(duration), priority=priority) for name, arrival, duration, priority in zip(process_names, arrival_times, durations, priorities)]
-    schedulerFCFS.set_processes(processes)
-    process_names, start_times, durations = schedulerFCFS.run()
-    processes2["FCFS"] = process_names
-    start_times2["FCFS"] = start_times
-    durations2["FCFS"] = durations
-    arrival_times2["FCFS"] = arrival_time_dict
-    print("Arrival Time Dict: ", arrival_time_dict)
-
-    schedulerSJF.set_algorithm(sjf)
-    process_names = [job['pid'] for job in job_data]
-    arrival_times = [job['arrival_time'] for job in job_data]
-    arrival_time_dict = {name: arrival for name, arrival in zip(process_names, arrival_times)}
-    durations = [job['burst_time'] for job in job_data]
-    priorities = [job['priority'] for job in job_data]
-    processes = [Process(name, int(arrival), int(duration), priority=priority) for name, arrival, duration, priority in zip(process_names, arrival_times, durations, priorities)]
-    schedulerSJF.set_processes(processes)
-    process_names, start_times, durations = schedulerSJF.run()
-    processes2["SJF"] = process_names
-    start_times2["SJF"] = start_times
-    durations2["SJF"] = durations
-    arrival_times2["SJF"] = arrival_time_dict
-    print("Arrival Time Dict: ", arrival_time_dict)
-
-    schedulerP.set_algorithm(priori)
-    process_names = [job['pid'] for job in job_data]
-    arrival_times = [job['arrival_time'] for job in job_data]
-    arrival_time_dict = {name: arrival for name, arrival in zip(process_names, arrival_times)}
-    durations = [job['burst_time'] for job in job_data]
-    priorities = [job['priority'] for job in job_data]
-    processes = [Process(name, int(arrival), int(duration), priority=priority) for name, arrival, duration, priority in zip(process_names, arrival_times, durations, priorities)]
-    schedulerP.set_processes(processes)
-    process_names, start_times, durations = schedulerP.run()
-    processes2["P"] = process_names
-    start_times2["P"] = start_times
-    durations2["P"] = durations
-    arrival_times2["P"] = arrival_time_dict
-    print("Arrival Time Dict: ", arrival_time_dict)
-
-    schedulerRR.set_algorithm(rr)
-    process_names = [job['pid'] for job in job_data]
-    arrival_times = [job['arrival_time'] for job in job_data]
-    arrival_time_dict = {name: arrival for name, arrival in zip(process_names, arrival_times)}
-    durations = [job['burst_time'] for job in job_data]
-    priorities = [job['priority'] for job in job_data]
-    processes = [Process(name, int(arrival), int(duration), priority=priority) for name, arrival, duration, priority in zip(process_names, arrival_times, durations, priorities)]
-    schedulerRR.set_processes(processes)
-    process_names, start_times, durations = schedulerRR.run()
-    processes2["RR"] = process_names
-    start_times2["RR"] = start_times
-    durations2["RR"] = durations
-    arrival_times2["RR"] = arrival_time_dict
-    print("Arrival Time Dict: ", arrival_time_dict)
-
-    schedulerPRR.set_algorithm(prioriRR)
-    process_names = [job['pid'] for job in job_data]
-    arrival_times = [job['arrival_time'] for job in job_data]
-    arrival_time_dict = {name: arrival for name, arrival in zip(process_names, arrival_times)}
-    durations = [job['burst_time'] for job in job_data]
-    priorities = [job['priority'] for job in job_data]
-    processes = [Process(name, int(arrival), int(duration), priority=priority) for name, arrival, duration, priority in zip(process_names, arrival_times, durations, priorities)]
-    schedulerPRR.set_processes(processes)
-    process_names, start_times, durations = schedulerPRR.run()
-    processes2["PRR"] = process_names
-    start_times2["PRR"] = start_times
-    durations2["PRR"] = durations
-    arrival_times2["PRR"] = arrival_time_dict
-    print("Arrival Time Dict: ", arrival_time_dict)
-
-    renderComparison(processes2, start_times2, durations2, arrival_times2)
-    return redirect(url_for('render_dashboard'))
+@app.route('/sweep', methods=['POST'])
+def quantumSweep():
+    """
+    Endpoint to evaluate the round robin algorithms over a range of time quanta.
+
+    Returns:
+        Response: Redirects to the dashboard.
+    """
+    if 'file' not in request.files:
+        return redirect(request.url)
+    file = request.files['file']
+    if file.filename == '':
+        return redirect(request.url)
+    timer = request_timer()
+    try:
+        with timer.phase('parse'):
+            processes = read_workload(file.stream, max_rows=MAX_UPLOAD_ROWS, max_bytes=MAX_UPLOAD_BYTES)
+        quanta = parse_quanta(request.form["quanta"])
+    except Exception as e:
+        logger.info("Rejected sweep upload %s: %s", file.filename, e)
+        return f"Error: {str(e)}"
+    timer.size = len(processes)
+
+    # Quanta already evaluated on this workload come from the cache, and the
+    # missing ones of every algorithm run together in one pool
+    digest = workload_digest(processes)
+    jobs = [(algorithm, quantum) for algorithm in SWEPT_ALGORITHMS for quantum in quanta]
+    keys = {job: result_cache.make_key(digest, *job, kind="summary") for job in jobs}
+    points = {job: result_cache.get(key) for job, key in keys.items()}
+    missing = [job for job, point in points.items() if point is None]
+    for job, point in zip(missing, run_sweep_jobs(processes, missing, timeout=COMPARISON_TIMEOUT)):
+        points[job] = point
+        for phase, seconds in (point.phase_times or {}).items():
+            timer.add(phase, seconds, job[0])
+        if point.error != "Timed out":
+            result_cache.put(keys[job], point)
+    results = {algorithm: [points[algorithm, quantum] for quantum in quanta] for algorithm in SWEPT_ALGORITHMS}
+
+    with timer.phase('serialize'):
+        run_id = result_store.save({'kind': 'sweep', 'results': results})
+    return redirect(url_for('render_dashboard', run=run_id))
 
 if __name__ == '__main__':
     app.run(debug=True)
@@ -0,0 +1,170 @@
+"""Check every algorithm against a naive unit-step reference on random workloads.
+
+The reference advances the clock one time unit at a time and keeps its ready
+queue in a plain list, so it shares no code with the discrete-event kernel in
+Simulation.py. Batch, run_iter and online scheduling must all reproduce it.
+"""
+import random
+
+import pytest
+
+from Process import Process
+from ProcessTable import ProcessTable
+from Scheduler import Scheduler
+from SchedulingAlgorithm import MLFQ, RR, make_algorithm
+
+TRIALS = 150
+
+
+def reference(rows, algorithm, quantum=None, levels=1, boost_interval=None):
+    """Schedule ``rows`` of (pid, arrival, burst, priority) one time unit at a time.
+
+    Returns:
+        list: (pid, start, duration) of every slice, in dispatch order.
+    """
+    arrival = [row[1] for row in rows]
+    remaining = [row[2] for row in rows]
+    priority = [row[3] for row in rows]
+    pending = sorted(range(len(rows)), key=lambda i: (arrival[i], i))
+    ready = []  # [row, level] in queue order
+    if algorithm == "MLFQ":
+        quanta = [quantum << level for level in range(levels)]
+    else:
+        quanta = [quantum]
+    next_boost = boost_interval
+    segments = []
+    time = 0
+    finished = 0
+
+    def admit():
+        while pending and arrival[pending[0]] <= time:
+            ready.append([pending.pop(0), 0])
+
+    def pick():
+        if algorithm in ("FCFS", "RR"):
+            return 0
+        if algorithm == "MLFQ":
+            top = min(level for _, level in ready)
+            return next(k for k, (_, level) in enumerate(ready) if level == top)
+        if algorithm == "PriorityRR":
+            top = min(priority[row] for row, _ in ready)
+            return next(k for k, (row, _) in enumerate(ready) if priority[row] == top)
+        if algorithm == "Priority":
+            key = lambda entry: (priority[entry[0]], arrival[entry[0]], entry[0])
+        else:
+            key = lambda entry: (remaining[entry[0]], arrival[entry[0]], entry[0])
+        return ready.index(min(ready, key=key))
+
+    while finished < len(rows):
+        admit()
+        if not ready:
+            time = arrival[pending[0]]
+            continue
+        if algorithm == "MLFQ" and time >= next_boost:
+            # Every level moves to the top, lower levels queued after higher ones
+            ready.sort(key=lambda entry: entry[1])
+            for entry in ready:
+                entry[1] = 0
+            next_boost = (time // boost_interval + 1) * boost_interval
+        row, level = ready.pop(pick())
+        length = remaining[row] if quantum is None else min(quanta[level], remaining[row])
+        segment = [rows[row][0], time, 0]
+        segments.append(segment)
+        while segment[2] < length:
+            remaining[row] -= 1
+            segment[2] += 1
+            time += 1
+            admit()
+            if algorithm == "SRTF" and remaining[row] and ready:
+                best = min(ready, key=lambda entry: (remaining[entry[0]], arrival[entry[0]], entry[0]))
+                if (remaining[best[0]], arrival[best[0]], best[0]) < (remaining[row], arrival[row], row):
+                    break
+        if remaining[row]:
+            ready.append([row, min(level + 1, len(quanta) - 1)])
+        else:
+            finished += 1
+    if algorithm == "SRTF":
+        return merge(segments)
+    return [tuple(segment) for segment in segments]
+
+
+def merge(segments):
+    """Join back-to-back segments of the same process."""
+    merged = []
+    for pid, start, duration in segments:
+        if merged and merged[-1][0] == pid and merged[-1][1] + merged[-1][2] == start:
+            merged[-1][2] += duration
+        else:
+            merged.append([pid, start, duration])
+    return [tuple(segment) for segment in merged]
+
+
+def random_rows(rng):
+    count = rng.randint(1, 20)
+    return [(f"P{i}", rng.randint(0, 30), rng.randint(0, 10), rng.randint(0, 3)) for i in range(count)]
+
+
+def as_table(rows):
+    return ProcessTable(*zip(*rows))
+
+
+def online_segments(algorithm, rows):
+    """Submit the rows in arrival order, advancing the clock to each arrival first."""
+    state = algorithm.online()
+    segments = []
+    for i in sorted(range(len(rows)), key=lambda i: (rows[i][1], i)):
+        segments += state.advance(rows[i][1])
+        state.submit(Process(*rows[i]))
+    segments += state.drain()
+    return segments
+
+
+CASES = [
+    ("FCFS", {}),
+    ("SJF", {}),
+    ("SRTF", {}),
+    ("Priority", {}),
+    ("RR", {"quantum": True}),
+    ("PriorityRR", {"quantum": True}),
+    ("MLFQ", {"quantum": True}),
+]
+
+
+def make_case(name, rng):
+    """Return the algorithm under test and the reference keyword arguments of one trial."""
+    if name == "MLFQ":
+        quantum, levels, boost_interval = rng.randint(1, 3), rng.randint(1, 4), rng.randint(1, 30)
+        return MLFQ(quantum, levels, boost_interval), dict(quantum=quantum, levels=levels, boost_interval=boost_interval)
+    if name in ("RR", "PriorityRR"):
+        quantum = rng.randint(1, 4)
+        return make_algorithm(name, quantum), dict(quantum=quantum)
+    return make_algorithm(name), {}
+
+
+@pytest.mark.parametrize("name", [name for name, _ in CASES])
+def test_matches_reference(name):
+    rng = random.Random(name)
+    for _ in range(TRIALS):
+        rows = random_rows(rng)
+        algorithm, options = make_case(name, rng)
+        expected = reference(rows, name, **options)
+
+        assert list(zip(*algorithm.schedule(as_table(rows)))) == expected
+
+        scheduler = Scheduler()
+        scheduler.set_algorithm(algorithm)
+        scheduler.set_processes(as_table(rows))
+        assert list(scheduler.run_iter()) == expected
+
+        assert online_segments(algorithm, rows) == expected
+
+
+def test_rr_merge_slices_matches_merged_schedule():
+    rng = random.Random("merge")
+    for _ in range(TRIALS):
+        rows = random_rows(rng)
+        quantum = rng.randint(1, 4)
+        table = as_table(rows)
+        merged = RR(quantum).schedule(table).merged()
+        assert list(zip(*RR(quantum, merge_slices=True).schedule(table))) == list(zip(*merged))
+        assert online_segments(RR(quantum, merge_slices=True), rows) == list(zip(*merged))